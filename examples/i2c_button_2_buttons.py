@@ -16,53 +16,31 @@ Demonstrate CircuitPython I2C Buttons
 import time
 import board
 import busio
-from i2c_button import I2C_Button
+from i2c_button.discovery import discover
 
 # initialize I2C
 i2c = busio.I2C(board.SCL, board.SDA)
 
-# scan the I2C bus for devices
-while not i2c.try_lock():
-    pass
-devices = i2c.scan()
-i2c.unlock()
-print("I2C devices found:", [hex(n) for n in devices])
-default_addr = 0x6F
-if default_addr not in devices:
-    print("warning: no device at the default button address", default_addr)
-
 # addresses
 ACK_ADDR = 0x6E
 SNZ_ADDR = 0x6F
 
-# initialize the buttons
-ack = I2C_Button(i2c, ACK_ADDR, name="ack")
-snz = I2C_Button(i2c, SNZ_ADDR, name="snz")
+# find the buttons: one scan, then one probe per responding device
+buttons = discover(i2c, by_address=True)
+print("buttons found:", [hex(addr) for addr in buttons])
+if ACK_ADDR not in buttons or SNZ_ADDR not in buttons:
+    print("warning: expected buttons at", hex(ACK_ADDR), "and", hex(SNZ_ADDR))
+ack = buttons[ACK_ADDR]
+snz = buttons[SNZ_ADDR]
 
 
 def button_values(button):
     """Print all public property values."""
-    attrs = (
-        "name",
-        "i2c_addr",
-        "dev_id",
-        "version",
-        "debounce_ms",
-        #       "interrupts",
-        "led_bright",
-        "led_gran",
-        "led_cycle_ms",
-        "led_off_ms",
-        "status",
-        #       "press_queue",
-        "last_press_ms",
-        "first_press_ms",
-        #       "click_queue",
-        "last_click_ms",
-        "first_click_ms",
-    )
-    for attr in attrs:
-        print(attr, getattr(button, attr))
+    # One bus transaction for the lot, rather than one per property.
+    snap = button.snapshot()
+    print("name", button.name)
+    for attr, value in zip(snap._fields, snap):
+        print(attr, value)
     print()
 
 
@@ -0,0 +1,286 @@
+# SPDX-FileCopyrightText: Copyright (c) 2021 Greg Paris
+#
+# SPDX-License-Identifier: MIT
+
+"""
+`i2c_button_benchmark`
+================================================================================
+
+Benchmark I2C Button access patterns on a simulated bus, on desktop CPython
+
+For each scenario and number of buttons, one JSON object per line:
+
+* **transactions**, **bytes** and **locks**: bus traffic per sweep
+* **bus_us**: simulated bus time per sweep, from the latency settings
+* **wall_us**: host time per sweep, i.e. the library's own overhead
+* **alloc_bytes**: peak heap allocated by the library during a sweep: the
+  peak of a sweep (tracemalloc), less that of the simulated bus alone
+
+Usage: ``python i2c_button_benchmark.py [--sizes 1,10,50,100] [--repeat 20]``
+
+* Author(s): Greg Paris
+"""
+
+# imports
+import argparse
+import json
+import time
+import tracemalloc
+from i2c_button import I2C_Button, ButtonBank
+from i2c_button.discovery import build_buttons, discover
+from i2c_button.simulator import SimButton, SimClock, SimI2C
+
+FIRST_ADDR = 0x08
+
+# the attributes printed by the two-buttons example
+DUMP_ATTRS = (
+    "i2c_addr",
+    "dev_id",
+    "version",
+    "debounce_ms",
+    "led_bright",
+    "led_gran",
+    "led_cycle_ms",
+    "led_off_ms",
+    "status",
+    "last_press_ms",
+    "first_press_ms",
+    "last_click_ms",
+    "first_click_ms",
+)
+
+
+def status_reads(_, buttons):
+    def sweep():
+        for button in buttons:
+            _ = button.status
+
+    return sweep
+
+
+def status_flags(_, buttons):
+    def sweep():
+        for button in buttons:
+            _ = button.flags
+
+    return sweep
+
+
+def bank_poll(_, buttons):
+    bank = ButtonBank(buttons)
+    return bank.poll
+
+
+def bank_changes(_, buttons):
+    bank = ButtonBank(buttons)
+    return bank.changes
+
+
+def attribute_dump(_, buttons):
+    def sweep():
+        for button in buttons:
+            for attr in DUMP_ATTRS:
+                getattr(button, attr)
+
+    return sweep
+
+
+def snapshot_dump(_, buttons):
+    def sweep():
+        for button in buttons:
+            button.snapshot()
+
+    return sweep
+
+
+def construct(i2c, buttons):
+    addrs = [button.device.device_address for button in buttons]
+
+    def sweep():
+        for addr in addrs:
+            I2C_Button(i2c, addr)
+
+    return sweep
+
+
+def construct_discover(i2c, _):
+    def sweep():
+        discover(i2c)
+
+    return sweep
+
+
+def construct_build(i2c, buttons):
+    addrs = [button.device.device_address for button in buttons]
+
+    def sweep():
+        build_buttons(i2c, addrs)
+
+    return sweep
+
+
+def led_setup(_, buttons):
+    def sweep():
+        for button in buttons:
+            button.led_bright = 128
+            button.led_gran = 1
+            button.led_cycle_ms = 1000
+            button.led_off_ms = 200
+
+    return sweep
+
+
+def led_set_led(_, buttons):
+    def sweep():
+        for button in buttons:
+            button.set_led(128, 1, 1000, 200)
+
+    return sweep
+
+
+def led_bank_toggle(_, buttons):
+    bank = ButtonBank(buttons)
+    states = [
+        {button: (255 if i == lit else 0, 0, 0, 0) for i, button in enumerate(buttons)}
+        for lit in (0, len(buttons) - 1)
+    ]
+
+    def sweep():
+        for state in states:  # the lit LED moves, the rest stay off
+            bank.set_leds(state)
+
+    return sweep
+
+
+def read_and_clear(_, buttons):
+    def sweep():
+        for button in buttons:
+            _ = button.status, button.last_press_ms, button.last_click_ms
+            button.clear()
+
+    return sweep
+
+
+def consume(_, buttons):
+    def sweep():
+        for button in buttons:
+            button.consume()
+
+    return sweep
+
+
+PROVISION = {
+    "debounce_ms": 25,
+    "led_bright": 0,
+    "led_gran": 1,
+    "led_cycle_ms": 0,
+    "led_off_ms": 0,
+}
+
+
+def provision_attrs(_, buttons):
+    def sweep():
+        for button in buttons:
+            for attr, value in PROVISION.items():
+                setattr(button, attr, value)
+
+    return sweep
+
+
+def provision_configure(_, buttons):
+    bank = ButtonBank(buttons)
+
+    def sweep():
+        bank.configure(verify=True, **PROVISION)
+
+    return sweep
+
+
+SCENARIOS = {
+    "status": status_reads,
+    "status_flags": status_flags,
+    "bank_poll": bank_poll,
+    "bank_changes": bank_changes,
+    "attribute_dump": attribute_dump,
+    "snapshot_dump": snapshot_dump,
+    "construct": construct,
+    "construct_discover": construct_discover,
+    "construct_build": construct_build,
+    "led_setup": led_setup,
+    "led_set_led": led_set_led,
+    "led_bank_toggle": led_bank_toggle,
+    "read_and_clear": read_and_clear,
+    "consume": consume,
+    "provision_attrs": provision_attrs,
+    "provision_configure": provision_configure,
+}
+
+
+def make_bus(n_buttons, latency, byte_time):
+    """A simulated bus with **n_buttons** buttons, and their drivers."""
+    i2c = SimI2C(SimClock(), latency=latency, byte_time=byte_time)
+    addrs = range(FIRST_ADDR, FIRST_ADDR + n_buttons)
+    for addr in addrs:
+        i2c.add(SimButton(addr))
+    return i2c, [I2C_Button(i2c, addr) for addr in addrs]
+
+
+def bus_peak(i2c, addr):
+    """Peak heap allocated by the simulated bus itself, in the costliest
+    transactions the library makes: a register write, a block read."""
+    regid = bytearray(1)
+    buf = bytearray(0x20)
+    while not i2c.try_lock():
+        pass
+    try:
+        tracemalloc.start()
+        i2c.writeto(addr, regid)
+        i2c.writeto_then_readfrom(addr, regid, buf)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    finally:
+        i2c.unlock()
+    return peak
+
+
+def measure(name, n_buttons, args):
+    i2c, buttons = make_bus(n_buttons, args.latency, args.byte_time)
+    sweep = SCENARIOS[name](i2c, buttons)
+    sweep()  # warm up
+    i2c.reset_counters()
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        sweep()
+    wall = (time.perf_counter() - start) / args.repeat
+    result = {
+        "scenario": name,
+        "buttons": n_buttons,
+        "transactions": i2c.transactions / args.repeat,
+        "bytes": (i2c.bytes_written + i2c.bytes_read) / args.repeat,
+        "locks": i2c.locks / args.repeat,
+        "bus_us": round(i2c.busy_time / args.repeat * 1e6, 1),
+        "wall_us": round(wall * 1e6, 1),
+    }
+    tracemalloc.start()
+    sweep()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    result["alloc_bytes"] = max(0, peak - bus_peak(i2c, FIRST_ADDR))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[4])
+    parser.add_argument("--sizes", default="1,10,50,100")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0002)
+    parser.add_argument("--byte-time", type=float, default=0.00009)  # 100 kHz
+    args = parser.parse_args()
+    for name in args.scenarios.split(","):
+        for n_buttons in (int(size) for size in args.sizes.split(",")):
+            print(json.dumps(measure(name, n_buttons, args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# SPDX-FileCopyrightText: Copyright (c) 2021 Greg Paris
+#
+# SPDX-License-Identifier: MIT
+
+"""
+`i2c_button_gestures`
+================================================================================
+
+Recognize clicks, double-clicks, long presses and hold-repeat, polling ten
+times a second, on a simulated bus, on desktop CPython
+
+
+* Author(s): Greg Paris
+"""
+
+# imports
+from i2c_button.discovery import build_buttons
+from i2c_button.gestures import GestureRecognizer
+from i2c_button.simulator import SimButton, SimClock, SimI2C
+
+KINDS = {1: "click", 2: "double-click", 3: "long press", 4: "repeat"}
+
+clock = SimClock()
+i2c = SimI2C(clock)
+sim = i2c.add(SimButton(0x6F))
+gestures = GestureRecognizer(
+    build_buttons(i2c, [0x6F]),
+    repeat_ms=250,
+    clock_ms=lambda: int(clock.monotonic() * 1000),
+)
+
+# (time in ms, action): a click, a double-click, then a 1.5 second hold
+SCRIPT = [
+    (100, sim.press),
+    (180, sim.release),
+    (1000, sim.press),
+    (1080, sim.release),
+    (1200, sim.press),
+    (1270, sim.release),
+    (2000, sim.press),
+    (3500, sim.release),
+]
+
+for ms in range(4000):
+    clock.now = ms / 1000
+    while SCRIPT and SCRIPT[0][0] <= ms:
+        SCRIPT.pop(0)[1]()
+    if ms % 100 == 0:
+        for gesture in gestures.poll():
+            print(ms, KINDS[gesture.kind], gesture.ms, "ms ago")
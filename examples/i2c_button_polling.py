@@ -16,7 +16,8 @@ Demonstrate Polling of CircuitPython I2C Buttons
 import time
 import board
 import busio
-from i2c_button import I2C_Button
+from i2c_button import I2C_Button, ButtonBank
+from i2c_button.scheduler import PollScheduler
 
 # addresses
 ADDRS = (0x6E, 0x6F)  # as many buttons as you have!
@@ -26,33 +27,30 @@ i2c = busio.I2C(board.SCL, board.SDA)
 # initialize the buttons
 buttons = []
 for bid, addr in enumerate(ADDRS):
-    btn = I2C_Button(i2c, addr, name="btn" + str(bid))
+    btn = I2C_Button(i2c, addr, name="btn" + str(bid), cache=True)
     buttons.append(btn)
     btn.debounce_ms = 25  # default is 10 ms, but it seems too short
-    btn.led_bright = btn.led_gran = 0
-    btn.led_cycle_ms = btn.led_off_ms = 0
-
-
-def clear_all():
-    """Clear status of all buttons."""
-    for cbtn in buttons:
-        cbtn.clear()
+    btn.set_led(0, 0, 0, 0)  # bright, gran, cycle_ms, off_ms in one write
+# a bank reads or clears all of them under a single bus lock
+bank = ButtonBank(buttons)
+# poll quickly while buttons are in use, slowly while they are not
+scheduler = PollScheduler(bank, max_interval=0.500)
 
 
 # In this example, the LED associated with each button should light
 # if that button was the first one pressed in the round. (Sort of.)
-clear_all()
+bank.clear_all()
 while True:
-    # Next line, sleep time should be longer than debounce time.
-    # However, the best reason for using an I2C button is to avoid
-    # a tight button-polling loop, so let's use a big sleep here.
-    time.sleep(0.500)
-    clicked = [btn for btn in buttons if btn.status.been_clicked]
+    # The scheduler never sleeps for less than the debounce time.
+    # The best reason for using an I2C button is to avoid a tight
+    # button-polling loop, so it backs off to 500 ms when idle.
+    time.sleep(scheduler.interval)
+    active = bank.poll()
+    scheduler.update(active)
+    clicked = [btn for btn in active if bank.status_of(btn).been_clicked]
     nclicked = len(clicked)
     if nclicked == 0:
         continue
-    for btn in buttons:
-        btn.led_bright = 0
     if nclicked == 1:
         wbtn = clicked[0]
     else:
@@ -62,6 +60,7 @@ while True:
         # NOTE: This will crash when two buttons have the same last_click_ms,
         # if the sort code is commented out in the I2C_Button definition.
         wbtn = sorted([(btn.last_click_ms, btn) for btn in clicked])[-1][1]
-    wbtn.led_bright = 255
+    # all LEDs off but the winner's; only those that change are written
+    bank.set_leds({btn: (255 if btn is wbtn else 0, 0, 0, 0) for btn in buttons})
     print(wbtn.name)
-    clear_all()
+    bank.clear_all()
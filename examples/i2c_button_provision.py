@@ -0,0 +1,35 @@
+# SPDX-FileCopyrightText: Copyright (c) 2021 Greg Paris
+#
+# SPDX-License-Identifier: MIT
+
+"""
+`i2c_button_provision`
+================================================================================
+
+Commission a panel of Sparkfun Qwiic Buttons: connect new buttons one at a
+time, and each is given the next address of the plan and the configuration.
+Run it again at any time to check the panel, or to finish an interrupted job.
+
+* Author(s): Greg Paris
+"""
+
+# imports
+import board
+import busio
+from i2c_button.provision import Provisioner
+
+PLAN = range(0x10, 0x18)  # eight buttons
+
+# initialize I2C
+i2c = busio.I2C(board.SCL, board.SDA)
+
+provisioner = Provisioner(i2c, PLAN, debounce_ms=20, led_bright=0)
+
+
+def connect(addr):
+    answer = input("connect the button for " + hex(addr) + " (or q to stop) ")
+    return answer != "q"
+
+
+for result in provisioner.run(connect):
+    print(hex(result.address), result.outcome, result.detail or "")
@@ -0,0 +1,48 @@
+# SPDX-FileCopyrightText: Copyright (c) 2021 Greg Paris
+#
+# SPDX-License-Identifier: MIT
+
+"""
+`i2c_button_simulator`
+================================================================================
+
+Exercise I2C Buttons on a simulated bus, on desktop CPython, without hardware
+
+
+* Author(s): Greg Paris
+"""
+
+# imports
+from i2c_button import ButtonBank
+from i2c_button.discovery import discover
+from i2c_button.simulator import SimButton, SimClock, SimI2C
+
+# a 100 kHz bus with fifty buttons on it, and a clock that only
+# moves when we, or the bus, advance it
+clock = SimClock()
+i2c = SimI2C(clock, latency=0.0002, byte_time=0.00009)
+sims = [i2c.add(SimButton(addr)) for addr in range(0x10, 0x42)]
+
+buttons = discover(i2c)
+bank = ButtonBank(buttons)
+print("found", len(buttons), "buttons in", i2c.transactions, "transactions")
+
+# somebody clicks two of them
+for sim in sims[3], sims[40]:
+    sim.press()
+    clock.advance(0.150)
+    sim.release()
+clock.advance(0.050)
+
+i2c.reset_counters()
+for event in bank.events():
+    print(event.__class__.__name__, event.button.name, event.ms, "ms ago")
+print(
+    "sweep took",
+    i2c.transactions,
+    "transactions,",
+    i2c.bytes_written + i2c.bytes_read,
+    "bytes,",
+    round(i2c.busy_time * 1000, 1),
+    "ms of bus time",
+)
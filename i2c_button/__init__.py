@@ -0,0 +1,931 @@
+# SPDX-FileCopyrightText: Copyright (c) 2020,2021 Greg Paris
+#
+# SPDX-License-Identifier: MIT
+
+# This library based upon Sparkfun's Arduino library and firmware sources:
+# github.com/sparkfun/SparkFun_Qwiic_Button_Arduino_Library/blob/master/src
+# github.com/sparkfunX/Qwiic_Switch/blob/master/Firmware/Qwiic_Button
+"""
+`i2c_button`
+================================================================================
+
+CircuitPython I2C Button à la Sparkfun Qwiic Button/Switch/Arcade
+
+
+* Author(s): Greg Paris
+
+Implementation Notes
+--------------------
+
+**Hardware:**
+
+* `Sparkfun Qwiic Button-Red <https://www.sparkfun.com/products/15584>`_
+* `Sparkfun Qwiic Button-Blue <https://www.sparkfun.com/products/15585>`_
+* `Sparkfun Qwiic Switch <https://www.sparkfun.com/products/15586>`_
+* `Sparkfun Qwiic Arcade-Red <https://www.sparkfun.com/products/15591>`_
+* `Sparkfun Qwiic Arcade-Blue <https://www.sparkfun.com/products/15592>`_
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython firmware for the supported boards:
+  https://github.com/adafruit/circuitpython/releases
+
+* Adafruit's Bus Device library:
+  https://github.com/adafruit/Adafruit_CircuitPython_BusDevice
+"""
+
+# imports
+from collections import namedtuple
+from adafruit_bus_device.i2c_device import I2CDevice
+
+__version__ = "0.0.0-auto.0"
+__repo__ = "https://github.com/gmparis/CircuitPython_i2c_button.git"
+
+_DEF_ADDR = 0x6F
+_DEV_ID = 0x5D
+
+# Button status flags and tuple
+_BS_EVENT = 0x1  # clear after use
+_BS_CLICKED = 0x2  # clear after use
+_BS_PRESSED = 0x4  # user immutable
+_BS = namedtuple("_BS", ("available", "been_clicked", "is_pressed"))
+
+#: :attr:`LeanButton.flags` bit: an event is pending.
+STATUS_EVENT = _BS_EVENT
+#: :attr:`LeanButton.flags` bit: the button was clicked.
+STATUS_CLICKED = _BS_CLICKED
+#: :attr:`LeanButton.flags` bit: the button is pressed now.
+STATUS_PRESSED = _BS_PRESSED
+
+# Button event tuples (see ButtonBank.events and ButtonBank.changes)
+#: A button was pressed **ms** milliseconds ago.
+PressEvent = namedtuple("PressEvent", ("button", "ms"))
+#: A button was clicked (pressed and released) **ms** milliseconds ago.
+ClickEvent = namedtuple("ClickEvent", ("button", "ms"))
+#: A button was released **ms** milliseconds ago.
+ReleaseEvent = namedtuple("ReleaseEvent", ("button", "ms"))
+
+# Consumed status tuple (see I2C_Button.consume)
+_EVENT_SPAN = 0x15 - 0x03  # BUTTON_STATUS through the last click time
+_CONSUMED = namedtuple(
+    "_CONSUMED",
+    ("available", "been_clicked", "is_pressed", "last_press_ms", "last_click_ms"),
+)
+
+# Register map snapshot tuple (see I2C_Button.snapshot)
+_MAP_LEN = 0x20  # registers 0x00 - 0x1F are contiguous
+_SNAP = namedtuple(
+    "_SNAP",
+    (
+        "dev_id",
+        "version",
+        "status",
+        "debounce_ms",
+        "last_press_ms",
+        "first_press_ms",
+        "last_click_ms",
+        "first_click_ms",
+        "led_bright",
+        "led_gran",
+        "led_cycle_ms",
+        "led_off_ms",
+        "i2c_addr",
+        "interrupts",
+    ),
+)
+
+# Interrupt status flags
+_INT_CL = 0x1  # enable an interrupt on button click
+_INT_PR = 0x2  # enable an interrupt on button press
+_INT = namedtuple("_INT", ("on_click", "on_press"))
+
+# Queue status flags and tuple
+_QS_POP = 0x1  # set to pop from queue
+_QS_EMPTY = 0x2  # user immutable
+_QS_FULL = 0x4  # user immutable
+_QS = namedtuple("_QS", ("empty", "full"))
+_QUEUE_LEN = 15  # entries in each firmware queue
+_BROKEN_QUEUES = ("1.1",)  # firmware versions whose queues cannot be popped
+
+
+def _to_qs(status):
+    """Queue status integer to **_QS** tuple."""
+    return _QS((status & _QS_EMPTY != 0), (status & _QS_FULL != 0))
+
+
+class ButtonError(Exception):
+    """Button-related error conditions."""
+
+
+_SCRATCH_LEN = 7  # register number plus the 6-byte LED block (see _led_run)
+
+
+# Register I/O goes through a small per-button scratch buffer, using the
+# start/end arguments of I2CDevice rather than slices, so that a steady-state
+# register access allocates nothing but (possibly) the resulting integer.
+def _decode(buf, offset, n_bytes=1):
+    """Little-endian integer at **offset** in **buf**."""
+    value = 0
+    i = offset + n_bytes
+    while i > offset:
+        i -= 1
+        value = (value << 8) | buf[i]
+    return value
+
+
+def _read_locked(button, register, n_bytes=1):
+    """Write the register number, read back the value. Bus must be locked."""
+    buf = button._buf  # pylint: disable=protected-access
+    buf[0] = register
+    button.device.write_then_readinto(
+        buf, buf, out_end=1, in_start=1, in_end=1 + n_bytes
+    )
+    return _decode(buf, 1, n_bytes)
+
+
+def _read_register(button, register, n_bytes=1):
+    """Write the register number, read back the value."""
+    with button.device:
+        return _read_locked(button, register, n_bytes)
+
+
+def _read_block_locked(button, register, buf):
+    """Write the starting register number, read back **len(buf)** bytes.
+    Bus must be locked."""
+    regid = button._buf  # pylint: disable=protected-access
+    regid[0] = register
+    button.device.write_then_readinto(regid, buf, out_end=1)
+
+
+def _read_block(button, register, buf):
+    """Write the starting register number, read back **len(buf)** bytes."""
+    with button.device:
+        _read_block_locked(button, register, buf)
+
+
+def _to_bs(status):
+    """Button status integer to **_BS** tuple."""
+    return _BS(
+        (status & _BS_EVENT != 0),
+        (status & _BS_CLICKED != 0),
+        (status & _BS_PRESSED != 0),
+    )
+
+
+def _write_locked(button, register, value, n_bytes=1):
+    """Write the register number, write the value. Bus must be locked."""
+    buf = button._buf  # pylint: disable=protected-access
+    buf[0] = register
+    i = 1
+    while i <= n_bytes:
+        buf[i] = value & 0xFF
+        value >>= 8
+        i += 1
+    button.device.write(buf, end=1 + n_bytes)
+
+
+def _write_register(button, register, value, n_bytes=1):
+    """Write the register number, write the value."""
+    with button.device:
+        _write_locked(button, register, value, n_bytes)
+
+
+# Several registers can be written in one transaction when they are contiguous.
+# A "run" is a sequence of such (register, n_bytes, value), in register order.
+def _mask(value, n_bytes):
+    """What a register of **n_bytes** will hold after **value** is written."""
+    return value & ((1 << (8 * n_bytes)) - 1)
+
+
+def _run_unchanged(button, run):
+    """Whether the button's cache shows the registers of **run** already hold its values."""
+    cache = button._cache  # pylint: disable=protected-access
+    if cache is None:
+        return False
+    for register, n_bytes, value in run:
+        if cache.get(register) != _mask(value, n_bytes):
+            return False
+    return True
+
+
+def _write_run_locked(button, run):
+    """Write the registers of **run** in one transaction. Bus must be locked."""
+    buf = button._buf  # pylint: disable=protected-access
+    length = 1
+    for _, n_bytes, _ in run:
+        length += n_bytes
+    if length > len(buf):
+        buf = bytearray(length)
+    buf[0] = run[0][0]
+    i = 1
+    for _, n_bytes, value in run:
+        for _ in range(n_bytes):
+            buf[i] = value & 0xFF
+            value >>= 8
+            i += 1
+    button.device.write(buf, end=length)
+    cache = button._cache  # pylint: disable=protected-access
+    if cache is not None:
+        for register, n_bytes, value in run:
+            cache[register] = _mask(value, n_bytes)
+
+
+def _led_run(state):
+    """Run setting LED_BRIGHTNESS, LED_PULSE_GRANULARITY, LED_PULSE_CYCLE_TIME
+    and LED_PULSE_OFF_TIME from (bright, gran, cycle_ms, off_ms)."""
+    bright, gran, cycle_ms, off_ms = state
+    return ((0x19, 1, bright), (0x1A, 1, gran), (0x1B, 2, cycle_ms), (0x1D, 2, off_ms))
+
+
+def _plan(fields):
+    """Fewest runs that write the named registers. (dict of name to value)
+
+    :raises AttributeError: if a name is not a configurable register
+    """
+    regs = []
+    for name, value in fields.items():
+        reg = vars(LeanButton).get(name)
+        if (
+            not isinstance(reg, _Reg)
+            or reg.readonly
+            or name.startswith("_")
+            or name == "i2c_addr"  # would move the device mid-plan
+        ):
+            raise AttributeError("cannot configure " + name)
+        regs.append((reg.addr, reg.width, value))
+    regs.sort()
+    runs = []
+    for reg in regs:
+        if runs and runs[-1][-1][0] + runs[-1][-1][1] == reg[0]:
+            runs[-1].append(reg)
+        else:
+            runs.append([reg])
+    return runs
+
+
+def _verify_locked(button, runs):
+    """Read back the span of **runs** in one transaction. Bus must be locked.
+    The button's cache, if any, is refilled from what was read back.
+
+    :raises ButtonError: if a register does not hold what was written
+    """
+    start = runs[0][0][0]
+    last = runs[-1][-1]
+    buf = bytearray(last[0] + last[1] - start)
+    _read_block_locked(button, start, buf)
+    cache = button._cache  # pylint: disable=protected-access
+    failed = None
+    for run in runs:
+        for register, n_bytes, value in run:
+            held = _decode(buf, register - start, n_bytes)
+            if cache is not None:
+                cache[register] = held
+            if failed is None and held != _mask(value, n_bytes):
+                failed = register, value
+    if failed is not None:
+        raise ButtonError(
+            f"register {failed[0]:02x} of button at i2c addr "
+            f"{button.device.device_address:02x} did not take {failed[1]}"
+        )
+
+
+# Registers marked cached change only when the host writes them, so when the
+# button was created with cache=True, reads come from the button's cache and
+# writes of an unchanged value never reach the bus.
+class _Reg:
+    __slots__ = ("addr", "width", "readonly", "cached")
+
+    def __init__(self, addr, width, readonly=False, cached=False):
+        self.addr = addr
+        self.width = width
+        self.readonly = readonly
+        self.cached = cached
+
+    def __get__(self, button, objtype):
+        cache = button._cache if self.cached else None
+        if cache is None:
+            return _read_register(button, self.addr, self.width)
+        value = cache.get(self.addr)
+        if value is None:
+            value = cache[self.addr] = _read_register(button, self.addr, self.width)
+        return value
+
+    def __set__(self, button, value):
+        if self.readonly:
+            raise AttributeError("write to read-only register " + hex(self.addr))
+        cache = button._cache if self.cached else None
+        if cache is None:
+            _write_register(button, self.addr, value, self.width)
+            return
+        value &= (1 << (8 * self.width)) - 1  # what the register will hold
+        if cache.get(self.addr) != value:
+            _write_register(button, self.addr, value, self.width)
+            cache[self.addr] = value
+
+
+class LeanButton:
+    """I2C-connected button, without the extras of :class:`I2C_Button`
+
+    Takes the same parameters as :class:`I2C_Button`, and has the same registers,
+    properties and methods. But its instances have no ``__dict__``, nor a sort key,
+    so each takes less memory; they compare equal only to themselves and cannot be
+    sorted. :attr:`flags` reads the status without allocating a tuple.
+    """
+
+    __slots__ = ("i2c", "device", "_buf", "_cache", "_name")
+
+    def __init__(
+        self,
+        i2c_obj,
+        i2c_addr=_DEF_ADDR,
+        dev_id=_DEV_ID,
+        name="button",
+        cache=False,
+        probe=True,
+    ):
+        # pylint: disable=too-many-arguments
+        self.i2c = i2c_obj
+        self.device = I2CDevice(i2c_obj, i2c_addr, probe)
+        self._buf = bytearray(_SCRATCH_LEN)  # shared by all register I/O
+        self._cache = {} if cache else None  # register address -> value
+        if probe and self.dev_id != dev_id:
+            raise ButtonError(
+                f"not button {self.dev_id:02x} at i2c addr {i2c_addr:02x}"
+            )
+        self._name = name
+
+    _fwmin = _Reg(0x01, 1, True, cached=True)  # FIRMWARE_MINOR (ro)
+    _fwmaj = _Reg(0x02, 1, True, cached=True)  # FIRMWARE_MAJOR (ro)
+    _bs = _Reg(0x03, 1)  # BUTTON_STATUS (see _BS flags above)
+
+    _int = _Reg(0x04, 1, cached=True)  # INTERRUPT_CONFIG (see _INT flags above)
+    _prqs = _Reg(0x07, 1)  # PRESSED_QUEUE_STATUS (see _QS flags above)
+    _clqs = _Reg(0x10, 1)  # CLICKED_QUEUE_STATUS (see _QS flags above)
+
+    #: Device ID. (1 byte; read-only)
+    dev_id = _Reg(0x00, 1, True, cached=True)
+
+    #: Button debounce time in milliseconds. (4 bytes; read-write)
+    debounce_ms = _Reg(0x05, 2, cached=True)
+
+    #: Time since most recent press in queue in milliseconds. (4 bytes; read-only)
+    last_press_ms = _Reg(0x08, 4, True)
+
+    #: Time since oldest press in queue in milliseconds. (4 bytes; read-only)
+    #:
+    #: Note that with firmware version 1.1, there is no way to clear the
+    #: queue, so this value is less useful than it might first seem.
+    first_press_ms = _Reg(0x0C, 4, True)
+
+    #: Time since most recent click in queue in milliseconds. (4 bytes; read-only)
+    last_click_ms = _Reg(0x11, 4, True)
+
+    #: Time since oldest click in queue in milliseconds. (4 bytes; read-only)
+    #:
+    #: Note that with firmware version 1.1, there is no way to clear the
+    #: queue, so this value is less useful than it might first seem.
+    first_click_ms = _Reg(0x15, 4, True)
+
+    #: LED brightness, 0 - 255. (1 byte; read-write)
+    led_bright = _Reg(0x19, 1, cached=True)
+
+    #: LED granularity. A value of 1 is commonly useful. (1 byte; read-write)
+    led_gran = _Reg(0x1A, 1, cached=True)
+
+    #: LED pulse cycle time in milliseconds. (4 bytes; read-write)
+    led_cycle_ms = _Reg(0x1B, 2, cached=True)
+
+    #: LED pulse off time in milliseconds. (4 bytes; read-write)
+    led_off_ms = _Reg(0x1D, 2, cached=True)
+
+    #: Button I2C address. (1 byte; read-write)
+    #:
+    #: If you set this property, you are changing the I2C address of the button. That change
+    #: will persist through power-off. When you make such a change, the :class:`I2C_Button`
+    #: instance will become invalid. Probably best to just make any such changes in a separate
+    #: program. One of the examples shows this.
+    i2c_addr = _Reg(0x1F, 1, cached=True)
+
+    @property
+    def name(self):
+        """Button name."""
+        return self._name
+
+    #   @property
+    #   def version(self):
+    #       """Firmware version number. (2 bytes; read-only)"""
+    #       return (self._fwmaj << 8) | self._fwmin  # same way as Arduino library but kooky
+
+    @property
+    def version(self):
+        """Firmware version string (read-only)"""
+        return f"{self._fwmaj:d}.{self._fwmin:d}"
+
+    @property
+    def status(self):
+        """Button status. (**available**, **been_clicked**, **is_pressed** tuple; read-only)"""
+        return _to_bs(self._bs)
+
+    @property
+    def flags(self):
+        """Button status as an integer of :data:`STATUS_EVENT`, :data:`STATUS_CLICKED`
+        and :data:`STATUS_PRESSED` bits. (read-only)
+
+        Unlike :attr:`status`, allocates nothing, so suits a tight polling loop.
+        """
+        return self._bs
+
+    def snapshot(self):
+        """Read the entire register map in a single I2C transaction.
+
+        Returns a tuple with fields **dev_id**, **version**, **status**,
+        **debounce_ms**, **last_press_ms**, **first_press_ms**,
+        **last_click_ms**, **first_click_ms**, **led_bright**, **led_gran**,
+        **led_cycle_ms**, **led_off_ms**, **i2c_addr** and **interrupts**, decoded just as the
+        corresponding properties would be. Reading them one at a time costs a
+        bus transaction each, so prefer this when you want more than a couple.
+        """
+        buf = bytearray(_MAP_LEN)
+        _read_block(self, 0x00, buf)
+        self._fill_cache(buf)
+        return _SNAP(
+            buf[0x00],
+            f"{buf[0x02]:d}.{buf[0x01]:d}",
+            _to_bs(buf[0x03]),
+            _decode(buf, 0x05, 2),
+            _decode(buf, 0x08, 4),
+            _decode(buf, 0x0C, 4),
+            _decode(buf, 0x11, 4),
+            _decode(buf, 0x15, 4),
+            buf[0x19],
+            buf[0x1A],
+            _decode(buf, 0x1B, 2),
+            _decode(buf, 0x1D, 2),
+            buf[0x1F],
+            _INT((buf[0x04] & _INT_CL != 0), (buf[0x04] & _INT_PR != 0)),
+        )
+
+    def clear(self):
+        """Reset button status."""
+        self._bs = 0
+
+    def consume(self):
+        """Read status and event times, and clear status, under one bus lock.
+
+        Returns a tuple of **available**, **been_clicked**, **is_pressed**,
+        **last_press_ms** and **last_click_ms**. Registers 0x03 through 0x14 are
+        read in one transaction, then, only if there was an event, status is
+        cleared in a second, immediately after.
+
+        Compared to reading :attr:`status` and the times, then calling :meth:`clear`,
+        this saves transactions and narrows the window in which an event arriving
+        between the read and the clear is lost to the gap between two back-to-back
+        transactions. (The firmware offers no way to close it entirely.)
+        """
+        buf = bytearray(_EVENT_SPAN)
+        with self.device:
+            _read_block_locked(self, 0x03, buf)
+            status = buf[0]
+            if status & (_BS_EVENT | _BS_CLICKED):
+                _write_locked(self, 0x03, 0)
+        return _CONSUMED(
+            (status & _BS_EVENT != 0),
+            (status & _BS_CLICKED != 0),
+            (status & _BS_PRESSED != 0),
+            _decode(buf, 0x08 - 0x03, 4),
+            _decode(buf, 0x11 - 0x03, 4),
+        )
+
+    def set_led(self, bright, gran=1, cycle_ms=0, off_ms=0):
+        """Set all four LED registers in a single transaction.
+
+        :param bright: LED brightness, 0 - 255
+        :param gran: LED granularity
+        :param cycle_ms: LED pulse cycle time in milliseconds; 0 for steady
+        :param off_ms: LED pulse off time in milliseconds
+
+        With **cache** enabled, nothing is written if the LED is already set so.
+        """
+        run = _led_run((bright, gran, cycle_ms, off_ms))
+        if not _run_unchanged(self, run):
+            with self.device:
+                _write_run_locked(self, run)
+
+    def configure(self, verify=False, **fields):
+        """Set several read-write registers at once, with as few transactions as can be.
+
+        :param verify: read the registers back afterward, in one transaction
+        :param fields: register property names and values, e.g. **debounce_ms=25**
+        :raises AttributeError: if a name is not a read-write register property
+            (nor may it be **i2c_addr**)
+        :raises ButtonError: if **verify** finds a register that did not take its value
+
+        Adjacent registers are written together, all under one bus lock. With
+        **cache** enabled, a group of registers that already hold their values is
+        not written.
+        """
+        runs = _plan(fields)
+        if not runs:
+            return
+        with self.device:
+            for run in runs:
+                if not _run_unchanged(self, run):
+                    _write_run_locked(self, run)
+            if verify:
+                _verify_locked(self, runs)
+
+    @property
+    def interrupts(self):
+        """Interrupts settings. (**on_click**, **on_press** tuple; read-only)
+
+        The button pulls its INT pin low while an enabled event is pending,
+        until its status is cleared. See :class:`~i2c_button.interrupts.InterruptDispatcher`.
+        """
+        intval = self._int
+        return _INT((intval & _INT_CL != 0), (intval & _INT_PR != 0))
+
+    def set_on_click(self, enable=True):
+        """Enable or disable **on_click** interrupt.
+
+        :param enable: True to enable interrupt (default)
+        """
+        if enable:
+            self._int |= _INT_CL
+        else:
+            self._int &= ~_INT_CL & 0xFF
+
+    def set_on_press(self, enable=True):
+        """Enable or disable **on_press** interrupt.
+
+        :param enable: True to enable interrupt (default)
+        """
+        if enable:
+            self._int |= _INT_PR
+        else:
+            self._int &= ~_INT_PR & 0xFF
+
+    @property
+    def click_queue(self):
+        """Click queue status. (**empty**, **full** tuple; read-only)"""
+        return _to_qs(self._clqs)
+
+    @property
+    def press_queue(self):
+        """Press queue status. (**empty**, **full** tuple; read-only)"""
+        return _to_qs(self._prqs)
+
+    def pop_click_queue(self):
+        """Get time since first click, pop click queue, return time.
+
+        :raises ButtonError: if queue is empty
+        :raises RuntimeError: if firmware version is 1.1
+        """
+        times = self._drain_queue(0x10, 1)
+        if not times:
+            raise ButtonError("click queue is empty")
+        return times[0]
+
+    def pop_press_queue(self):
+        """Get time since first press, pop press queue, return time.
+
+        :raises ButtonError: if queue is empty
+        :raises RuntimeError: if firmware version is 1.1
+        """
+        times = self._drain_queue(0x07, 1)
+        if not times:
+            raise ButtonError("press queue is empty")
+        return times[0]
+
+    def drain_clicks(self, limit=_QUEUE_LEN):
+        """Pop up to **limit** entries off the click queue, under one bus lock.
+
+        Returns a list of the times since each click in milliseconds, oldest first.
+        Each entry costs two transactions (queue status and oldest time are read
+        together, then the entry is popped), plus one to find the queue empty.
+
+        :raises RuntimeError: if firmware version is 1.1
+        """
+        return self._drain_queue(0x10, limit)
+
+    def drain_presses(self, limit=_QUEUE_LEN):
+        """Pop up to **limit** entries off the press queue, under one bus lock.
+
+        As :meth:`drain_clicks`, for presses.
+
+        :raises RuntimeError: if firmware version is 1.1
+        """
+        return self._drain_queue(0x07, limit)
+
+    def _drain_queue(self, base, limit):
+        """Pop the queue whose status register is **base**; return the times."""
+        version = self.version
+        if version in _BROKEN_QUEUES:
+            raise RuntimeError(f"queues unsupported by firmware version {version}")
+        buf = bytearray(9)  # queue status, newest time, oldest time
+        times = []
+        with self.device:
+            while len(times) < limit:
+                _read_block_locked(self, base, buf)
+                if buf[0] & _QS_EMPTY:
+                    break
+                times.append(_decode(buf, 5, 4))
+                _write_locked(self, base, _QS_POP)
+        return times
+
+    def refresh(self):
+        """Reload the configuration register cache from the device.
+
+        The whole register map is read in one transaction. Does nothing
+        if the button was created without **cache**.
+        """
+        if self._cache is not None:
+            buf = bytearray(_MAP_LEN)
+            _read_block(self, 0x00, buf)
+            self._fill_cache(buf)
+
+    def invalidate(self):
+        """Forget cached configuration register values.
+
+        Each will be read from the device on its next access.
+        """
+        if self._cache is not None:
+            self._cache.clear()
+
+    def _fill_cache(self, buf):
+        """Load cached registers from a block read of the register map."""
+        cache = self._cache
+        if cache is None:
+            return
+        for reg in vars(LeanButton).values():
+            if isinstance(reg, _Reg) and reg.cached:
+                cache[reg.addr] = _decode(buf, reg.addr, reg.width)
+
+
+def _describe(button):
+    """The ``repr`` of an :class:`I2C_Button`, for any button with a **name**."""
+    return "%s(%s, i2c_addr=%s, dev_id=%s, name=%s)" % (
+        button.__class__.__name__,
+        repr(button.i2c),
+        hex(button.i2c_addr),
+        hex(button.dev_id),
+        repr(button.name),
+    )
+
+
+class I2C_Button(LeanButton):
+    # pylint: disable=line-too-long
+    """I2C-connected button, à la Sparkfun Qwiic Button/Switch/Arcade
+
+    :param i2c_obj: initialized I2C object
+    :param i2c_addr: I2C address of the button
+    :param dev_id: Device ID of the button
+    :param name: a name for the button
+    :param cache: serve configuration register reads from a write-through cache
+    :param probe: check for the device and its device ID now (see :func:`~i2c_button.discovery.discover`)
+    :raises ButtonError: if device I2C address does match the specified device ID
+
+    Besides being connected via I2C, which can provide some advantages when wiring up a project,
+    the I2C Button's chief advantage is that it has its own processor, which monitors the
+    state of the physical button. It does debouncing. It keeps track of time since the last
+    click event and the last press event. It reports whether a button has been pressed or
+    has been clicked since its state was last cleared. It can even manage operation of a
+    single (user-supplied) LED. That's a lot of processing that the calling program does not
+    have to do.
+
+    It also keeps queues of press and click events. Unfortunately, firmware version 1.1
+    doesn't quite hit the mark when it comes to queue management. It is not possible to
+    clear the queues, nor does popping an entry off a queue have an effect on its length.
+    So the methods that pop the queues raise an exception with that firmware. (To keep
+    every event anyway, see :class:`i2c_button.ring.EventRing`.)
+
+    With **cache** enabled, the configuration registers (:attr:`dev_id`, :attr:`debounce_ms`,
+    :attr:`interrupts`, the LED registers and :attr:`i2c_addr`) are read from the device only
+    once, and writing the value a register already holds costs no bus transaction. Status and
+    timing registers are always read from the device. Should anything other than this instance
+    change the device's configuration, call :meth:`refresh` or :meth:`invalidate`.
+
+    Buttons are sortable and hashable by name and I2C address, which makes it easier to
+    organize them when one has more than a few. The registers, properties and methods are
+    those of :class:`LeanButton`; where memory is tight, use that instead.
+    """
+
+    __slots__ = ("_key",)
+
+    def __init__(
+        self,
+        i2c_obj,
+        i2c_addr=_DEF_ADDR,
+        dev_id=_DEV_ID,
+        name="button",
+        cache=False,
+        probe=True,
+    ):
+        # pylint: disable=too-many-arguments
+        super().__init__(i2c_obj, i2c_addr, dev_id, name, cache, probe)
+        self._key = (name, i2c_addr)
+
+    def __eq__(self, other):
+        # pylint: disable=protected-access
+        return self._key == other._key
+
+    def __gt__(self, other):
+        # pylint: disable=protected-access
+        return self._key > other._key
+
+    def __lt__(self, other):
+        # pylint: disable=protected-access
+        return self._key < other._key
+
+    def __hash__(self):
+        return hash(self._key)
+
+    def __repr__(self):
+        return _describe(self)
+
+
+def _events_locked(button):
+    """New events of a button, its status then cleared. Bus must be locked."""
+    value = _read_locked(button, 0x03)
+    if not value & _BS_EVENT:
+        return ()
+    found = []
+    if value & _BS_CLICKED:
+        found.append(ClickEvent(button, _read_locked(button, 0x11, 4)))
+    if value & _BS_PRESSED:
+        found.append(PressEvent(button, _read_locked(button, 0x08, 4)))
+    _write_locked(button, 0x03, 0)
+    return found
+
+
+def _edges_locked(button, was, value, found):
+    """Append the edges from status **was** to **value** to **found**, and clear
+    the status if need be. Bus must be locked."""
+    down = value & _BS_PRESSED
+    if value & _BS_CLICKED:
+        ago = _read_locked(button, 0x11, 4)
+        if was & _BS_PRESSED:
+            found.append(ReleaseEvent(button, ago))
+        found.append(ClickEvent(button, ago))
+        if down:
+            found.append(PressEvent(button, _read_locked(button, 0x08, 4)))
+    elif down and not was & _BS_PRESSED:
+        found.append(PressEvent(button, _read_locked(button, 0x08, 4)))
+    elif was & _BS_PRESSED and not down:
+        found.append(ReleaseEvent(button, _read_locked(button, 0x11, 4)))
+    if value & (_BS_EVENT | _BS_CLICKED):
+        _write_locked(button, 0x03, 0)
+
+
+def _by_bus(buttons):
+    """Group buttons by the I2C bus they are on, preserving order."""
+    groups = []
+    for button in buttons:
+        for group in groups:
+            if group[0].i2c is button.i2c:
+                group.append(button)
+                break
+        else:
+            groups.append([button])
+    return groups
+
+
+class ButtonBank:
+    """A collection of :class:`I2C_Button` polled together.
+
+    :param buttons: iterable of :class:`I2C_Button`
+
+    Each property access of an :class:`I2C_Button` locks and unlocks the I2C bus.
+    A bank instead locks each bus once per sweep and talks to all of its buttons
+    on that bus back to back, which matters when there are dozens of them.
+    """
+
+    def __init__(self, buttons):
+        self.buttons = list(buttons)
+        self._groups = _by_bus(self.buttons)
+        #: Raw BUTTON_STATUS of each button, as read by the last :meth:`poll`.
+        #: (bytearray; same order as **buttons**)
+        self.flags = bytearray(len(self.buttons))
+        self._seen = bytearray(len(self.buttons))  # status as left by changes()
+        self._index = {id(button): i for i, button in enumerate(self.buttons)}
+        self._indexed = [  # as _groups, with each button's index
+            [(self._index[id(button)], button) for button in group]
+            for group in self._groups
+        ]
+
+    def __iter__(self):
+        return iter(self.buttons)
+
+    def __len__(self):
+        return len(self.buttons)
+
+    def poll(self):
+        """Read the status of every button. Return those with non-zero status.
+
+        Use :meth:`status_of` to see what a returned button's status was.
+        """
+        flags = self.flags
+        active = []
+        for group in self._indexed:
+            with group[0][1].device:
+                for i, button in group:
+                    value = _read_locked(button, 0x03)
+                    flags[i] = value
+                    if value:
+                        active.append(button)
+        return active
+
+    def status_of(self, button):
+        """Status of **button** as of the last :meth:`poll`.
+        (**available**, **been_clicked**, **is_pressed** tuple)"""
+        return _to_bs(self.flags[self._index[id(button)]])
+
+    def events(self):
+        """Sweep the buttons once. Return a list of new events.
+
+        A :class:`ClickEvent` is reported for a button that has been clicked and a
+        :class:`PressEvent` for one that has been pressed and is still down, in that
+        order. The timing register of an event is read only when its flag is set,
+        and the status of a button is cleared once its events have been collected.
+        """
+        found = []
+        for group in self._groups:
+            with group[0].device:
+                for button in group:
+                    found.extend(_events_locked(button))
+        return found
+
+    def changes(self):
+        """Sweep the buttons once. Return a list of the edges since the last sweep.
+
+        Each button's status byte is compared with what the last call of this
+        method left, whatever :meth:`poll` may have read since. Where it
+        differs, a :class:`ReleaseEvent` is reported if the button was down and
+        has since been let up, a :class:`ClickEvent` if it has been clicked, and
+        a :class:`PressEvent` if it is down and was not, or has been pressed
+        again, in that order. Only for a button with
+        an edge are the times needed read, and its status cleared.
+
+        A sweep in which nothing changed costs one 1-byte read per button, and
+        allocates nothing per button. A press and release both since the last
+        sweep show up only as a click.
+        """
+        seen = self._seen
+        found = []
+        for group in self._indexed:
+            with group[0][1].device:
+                for i, button in group:
+                    value = _read_locked(button, 0x03)
+                    if value != seen[i]:
+                        _edges_locked(button, seen[i], value, found)
+                        seen[i] = value & _BS_PRESSED
+        return found
+
+    def set_leds(self, states):
+        """Set the LEDs of many buttons, one transaction each, under one bus lock.
+
+        :param states: dict of button to (**bright**, **gran**, **cycle_ms**,
+            **off_ms**), as for :meth:`I2C_Button.set_led`; buttons not in it are
+            left alone
+
+        A button created with **cache** is skipped if its cache shows the LED
+        already in the requested state; any other is always written.
+        """
+        for group in self._groups:
+            todo = []
+            for button in group:
+                state = states.get(button)
+                if state is None:
+                    continue
+                run = _led_run(state)
+                if not _run_unchanged(button, run):
+                    todo.append((button, run))
+            if not todo:
+                continue
+            with group[0].device:
+                for button, run in todo:
+                    _write_run_locked(button, run)
+
+    def configure(self, verify=False, **fields):
+        """:meth:`I2C_Button.configure` every button, under one bus lock per bus.
+
+        :raises ButtonError: if **verify** finds a register that did not take its
+            value; buttons later in the bank are then not configured
+        """
+        runs = _plan(fields)
+        if not runs:
+            return
+        for group in self._groups:
+            with group[0].device:
+                for button in group:
+                    for run in runs:
+                        if not _run_unchanged(button, run):
+                            _write_run_locked(button, run)
+                    if verify:
+                        _verify_locked(button, runs)
+
+    def clear_all(self):
+        """Reset the status of every button."""
+        for group in self._groups:
+            with group[0].device:
+                for button in group:
+                    _write_locked(button, 0x03, 0)
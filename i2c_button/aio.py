@@ -0,0 +1,69 @@
+# SPDX-FileCopyrightText: Copyright (c) 2021 Greg Paris
+#
+# SPDX-License-Identifier: MIT
+"""
+`i2c_button.aio`
+================================================================================
+
+Button events for asyncio programs.
+
+Rather than blocking in a ``time.sleep()`` polling loop, let the event loop
+run other tasks between sweeps of the buttons:
+
+.. code-block:: python
+
+    async def main():
+        async for event in button_events(buttons):
+            print(event)
+
+**Software and Dependencies:**
+
+* Adafruit CircuitPython asyncio library (or CPython's ``asyncio``):
+  https://github.com/adafruit/Adafruit_CircuitPython_asyncio
+"""
+
+# imports
+import asyncio
+from i2c_button import ButtonBank
+from i2c_button.scheduler import PollScheduler
+
+
+class _EventStream:
+    """Asynchronous iterator over the events of a :class:`ButtonBank`."""
+
+    def __init__(self, bank, interval, scheduler):
+        self.bank = bank
+        self.interval = interval
+        self.scheduler = scheduler
+        self._pending = []
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        scheduler = self.scheduler
+        while not self._pending:
+            await asyncio.sleep(scheduler.interval if scheduler else self.interval)
+            self._pending = self.bank.events()
+            if scheduler:
+                scheduler.update(self._pending)
+        return self._pending.pop(0)
+
+
+def button_events(buttons, interval=0.05, adaptive=False):
+    """Asynchronous iterator of :class:`~i2c_button.PressEvent` and
+    :class:`~i2c_button.ClickEvent` for a group of buttons.
+
+    :param buttons: a :class:`~i2c_button.ButtonBank` or iterable of
+        :class:`~i2c_button.I2C_Button`
+    :param interval: seconds to sleep between sweeps of the buttons
+    :param adaptive: let a :class:`~i2c_button.scheduler.PollScheduler` pick the sleep
+        time instead, with **interval** as its longest
+
+    The buttons are swept by :meth:`~i2c_button.ButtonBank.events`, which clears
+    each button's status once its events are collected. The iterator never ends.
+    """
+    if not isinstance(buttons, ButtonBank):
+        buttons = ButtonBank(buttons)
+    scheduler = PollScheduler(buttons, interval) if adaptive else None
+    return _EventStream(buttons, interval, scheduler)
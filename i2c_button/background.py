@@ -0,0 +1,214 @@
+# SPDX-FileCopyrightText: Copyright (c) 2021 Greg Paris
+#
+# SPDX-License-Identifier: MIT
+"""
+`i2c_button.background`
+================================================================================
+
+Poll buttons from a background thread, under Blinka on CPython.
+
+A :class:`BackgroundPoller` sweeps its buttons in a thread of its own and hands
+the :class:`~i2c_button.ClickEvent` and :class:`~i2c_button.PressEvent` found to
+a bounded, thread-safe queue, or to a callback. The main thread takes events
+from the queue without ever waiting on the I2C bus.
+
+.. code-block:: python
+
+    with BackgroundPoller(buttons, interval=0.02) as poller:
+        while serving:
+            for event in poller.events():
+                print(event.button.name, event.ms)
+            ...
+    print(poller.stats())
+
+The bus is held for at most **burst** buttons at a time, and let go in between,
+so other drivers on the same bus get their turn during a sweep of many buttons.
+
+This module needs ``threading``, so it is not for CircuitPython boards.
+"""
+
+# imports
+from collections import namedtuple
+from queue import Empty, Full, Queue
+import threading
+import time
+from i2c_button import _by_bus, _events_locked
+from i2c_button.ring import DROP_NEWEST, DROP_OLDEST
+
+#: Counters of a :class:`BackgroundPoller`: **sweeps** made, **events** found,
+#: events **dropped** because the queue was full, button reads that raised
+#: **errors**, current queue **depth** and its high-water mark **max_depth**,
+#: and sweeps that **overran** the interval.
+PollerStats = namedtuple(
+    "PollerStats",
+    ("sweeps", "events", "dropped", "errors", "depth", "max_depth", "overran"),
+)
+
+
+class BackgroundPoller:
+    """Sweep buttons in a background thread.
+
+    :param buttons: a :class:`~i2c_button.ButtonBank` or iterable of
+        :class:`~i2c_button.I2C_Button`
+    :param interval: seconds from the start of one sweep to the start of the next
+    :param maxsize: most events queued
+    :param policy: :data:`~i2c_button.ring.DROP_OLDEST` or
+        :data:`~i2c_button.ring.DROP_NEWEST`, when the queue is full
+    :param callback: if given, called in the poller's thread with each event,
+        instead of queueing it
+    :param burst: most buttons talked to per bus lock
+
+    A callback runs in the poller's thread, so it must be quick and do its own
+    locking. An ``OSError`` from a button is counted, kept in **last_error**, and
+    the sweep goes on with the next button. (To stop trying a button that keeps
+    failing, see :class:`~i2c_button.health.GuardedBank`.)
+    """
+
+    def __init__(
+        self,
+        buttons,
+        interval=0.02,
+        maxsize=256,
+        policy=DROP_OLDEST,
+        callback=None,
+        burst=8,
+    ):
+        # pylint: disable=too-many-arguments
+        self.buttons = list(buttons)
+        self.interval = interval
+        self.policy = policy
+        self.callback = callback
+        self.queue = Queue(maxsize)
+        #: The latest ``OSError`` raised by a button, or None.
+        self.last_error = None
+        self._chunks = []
+        for group in _by_bus(self.buttons):
+            for i in range(0, len(group), burst):
+                self._chunks.append(group[i : i + burst])
+        self._counts = [0] * 6  # sweeps, events, dropped, errors, max_depth, overran
+        self._counts_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    @property
+    def running(self):
+        """Whether the poller's thread is alive. (read-only)"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the poller's thread. Does nothing if it is running."""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="i2c_button poller", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """Stop the poller's thread, waiting up to **timeout** seconds for it.
+
+        A sweep in progress is finished first. Events already queued stay queued.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if not self._thread.is_alive():
+                self._thread = None
+
+    def get(self, timeout=None):
+        """Take the next event, waiting up to **timeout** seconds; None if there is none.
+
+        As with ``queue.Queue.get``, a **timeout** of None waits for as long as
+        it takes. A **timeout** of 0 does not wait at all.
+        """
+        try:
+            return self.queue.get(timeout is None or timeout > 0, timeout)
+        except Empty:
+            return None
+
+    def events(self):
+        """Take all the events queued, oldest first, without waiting."""
+        found = []
+        while True:
+            try:
+                found.append(self.queue.get_nowait())
+            except Empty:
+                return found
+
+    def stats(self):
+        """Snapshot of the counters, as a :class:`PollerStats`."""
+        with self._counts_lock:
+            sweeps, events, dropped, errors, max_depth, overran = self._counts
+        depth = self.queue.qsize()
+        return PollerStats(sweeps, events, dropped, errors, depth, max_depth, overran)
+
+    def reset_stats(self):
+        """Zero the counters."""
+        with self._counts_lock:
+            self._counts[:] = [0] * 6
+
+    def _run(self):
+        interval = self.interval
+        start = time.monotonic()
+        while not self._stop.is_set():
+            self.sweep()
+            start += interval
+            delay = start - time.monotonic()
+            if delay < 0:  # fell behind; start afresh rather than catch up
+                with self._counts_lock:
+                    self._counts[5] += 1
+                start = time.monotonic()
+                delay = 0
+            self._stop.wait(delay)
+
+    def sweep(self):
+        """Sweep the buttons once and deliver the events found. Returns how many.
+
+        Called by the poller's thread; call it yourself only when that isn't running.
+        """
+        found = []
+        errors = 0
+        for chunk in self._chunks:
+            with chunk[0].device:
+                for button in chunk:
+                    try:
+                        found.extend(_events_locked(button))
+                    except OSError as exc:
+                        self.last_error = exc
+                        errors += 1
+            time.sleep(0)  # let a driver waiting for the bus have it
+        for event in found:
+            if self.callback is not None:
+                self.callback(event)
+            else:
+                self._put(event)
+        with self._counts_lock:
+            self._counts[0] += 1
+            self._counts[1] += len(found)
+            self._counts[3] += errors
+            self._counts[4] = max(self._counts[4], self.queue.qsize())
+        return len(found)
+
+    def _put(self, event):
+        """Queue an event, making room or dropping it as the policy says."""
+        while True:
+            try:
+                self.queue.put_nowait(event)
+                return
+            except Full:
+                with self._counts_lock:
+                    self._counts[2] += 1
+                if self.policy == DROP_NEWEST:
+                    return
+            try:
+                self.queue.get_nowait()
+            except Empty:
+                pass
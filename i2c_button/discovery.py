@@ -0,0 +1,207 @@
+# SPDX-FileCopyrightText: Copyright (c) 2021 Greg Paris
+#
+# SPDX-License-Identifier: MIT
+"""
+`i2c_button.discovery`
+================================================================================
+
+Find or check the buttons on a bus, all at once.
+
+.. code-block:: python
+
+    buttons = discover(i2c, path="/buttons.addrs")
+    # or, when the addresses are known
+    buttons = build_buttons(i2c, range(0x08, 0x30), cache=True)
+
+:func:`discover` scans the bus and :func:`build_buttons` checks the addresses
+it is given. Either reads every device under a single bus lock, then creates
+the buttons without probing them one by one.
+"""
+
+# imports
+from i2c_button import _DEV_ID, ButtonError, I2C_Button
+
+
+class BuildError(ButtonError):
+    """Some of the buttons given to :func:`build_buttons` could not be made.
+
+    **problems** is a dict of I2C address to what is wrong there, and
+    **buttons** is a list of the buttons that were made all the same.
+    """
+
+    def __init__(self, problems, buttons):
+        super().__init__(
+            "; ".join(f"{addr:02x}: {problems[addr]}" for addr in sorted(problems))
+        )
+        self.problems = problems
+        self.buttons = buttons
+
+
+def _identify_locked(i2c, addr, regid, buf):
+    """Read device ID and firmware version into **buf**. Bus must be locked.
+
+    Returns False if nothing answered at **addr**.
+    """
+    try:
+        i2c.writeto_then_readfrom(addr, regid, buf)
+    except OSError:
+        return False
+    return True
+
+
+def _probe_addrs(i2c, dev_id, versions, exclude):
+    """Scan the bus, return addresses with a matching device ID and version.
+    Addresses in **exclude** are not touched."""
+    regid = bytearray(1)  # register 0x00: device ID, then firmware version
+    buf = bytearray(3)
+    found = []
+    while not i2c.try_lock():
+        pass
+    try:
+        for addr in i2c.scan():
+            if addr in exclude:
+                continue
+            if not _identify_locked(i2c, addr, regid, buf):
+                continue  # not something that talks like a button
+            if buf[0] != dev_id:
+                continue
+            if versions is not None and f"{buf[2]:d}.{buf[1]:d}" not in versions:
+                continue
+            found.append(addr)
+    finally:
+        i2c.unlock()
+    return found
+
+
+def _load_addrs(path):
+    """Addresses remembered by an earlier :func:`discover`, or None.
+
+    An empty file is as good as none: nothing was found then, so look again.
+    """
+    if path is None:
+        return None
+    try:
+        with open(path, "rb") as file:
+            return list(file.read()) or None
+    except OSError:
+        return None
+
+
+def _save_addrs(path, addrs):
+    """Remember discovered addresses, if there are any and it is possible."""
+    if path is None or not addrs:
+        return
+    try:
+        with open(path, "wb") as file:
+            file.write(bytes(addrs))
+    except OSError:
+        pass  # CircuitPython's filesystem is normally read-only to code
+
+
+def discover(  # pylint: disable=too-many-arguments
+    i2c,
+    dev_id=_DEV_ID,
+    versions=None,
+    by_address=False,
+    path=None,
+    exclude=(),
+    **kwargs
+):
+    """Find the buttons on an I2C bus.
+
+    :param i2c: initialized I2C object
+    :param dev_id: Device ID of the buttons
+    :param versions: if given, firmware version strings to accept
+    :param by_address: return a dict keyed by I2C address instead of a list
+    :param path: file in which to remember the addresses found
+    :param exclude: I2C addresses not to probe, e.g. of a multiplexer
+    :param kwargs: passed on to :class:`~i2c_button.I2C_Button`, e.g. **cache**
+    :return: :class:`~i2c_button.I2C_Button` instances, in address order,
+        named by address
+
+    The bus is scanned once, and every device that answered has its device ID
+    and firmware version read, all under a single bus lock. (So every device on
+    the bus sees register 0x00 written, then three bytes read, unless its
+    address is in **exclude**.) The buttons themselves are then created without
+    probing each one again.
+
+    If **path** names a file written by an earlier call, the addresses in it are
+    used without scanning or probing at all, which makes a warm restart quick.
+    Remove the file after rewiring. If the file does not exist, it is created
+    when possible, but only once some buttons have been found.
+    """
+    addrs = _load_addrs(path)
+    if addrs is None:
+        addrs = _probe_addrs(i2c, dev_id, versions, exclude)
+        _save_addrs(path, addrs)
+    buttons = [
+        I2C_Button(i2c, addr, dev_id, hex(addr), probe=False, **kwargs)
+        for addr in addrs
+    ]
+    if by_address:
+        return dict(zip(addrs, buttons))
+    return buttons
+
+
+def build_buttons(  # pylint: disable=too-many-arguments
+    i2c,
+    addrs,
+    dev_id=_DEV_ID,
+    check=True,
+    button_class=I2C_Button,
+    exclude=(),
+    **kwargs
+):
+    """Create many buttons at once, checking them all in one pass.
+
+    :param i2c: initialized I2C object
+    :param addrs: I2C addresses of the buttons, or a dict of address to name
+    :param dev_id: Device ID of the buttons
+    :param check: read every button's device ID first; if False, don't touch the bus
+    :param button_class: :class:`~i2c_button.I2C_Button` or
+        :class:`~i2c_button.LeanButton`
+    :param exclude: I2C addresses in **addrs** to skip, neither checked nor made
+    :param kwargs: passed on to **button_class**, e.g. **cache**
+    :return: buttons in the order of **addrs**, named as given or by address
+    :raises BuildError: if any address did not answer, or not with **dev_id**
+
+    Creating buttons one at a time probes each device, locking the bus for each.
+    Here the device IDs are read back to back under a single bus lock, then the
+    buttons are created without probing. Every problem found is reported in the
+    one :class:`BuildError`, whose **buttons** are those that checked out, so a
+    partly populated panel can still be started::
+
+        try:
+            buttons = build_buttons(i2c, range(0x08, 0x30))
+        except BuildError as err:
+            print(err)
+            buttons = err.buttons
+
+    With **check** False, a missing button goes unnoticed until first used,
+    when its register access raises ``OSError``.
+    """
+    if not isinstance(addrs, dict):
+        addrs = {addr: hex(addr) for addr in addrs}
+    names = {addr: name for addr, name in addrs.items() if addr not in exclude}
+    problems = {}
+    if check:
+        regid = bytearray(1)
+        buf = bytearray(3)
+        while not i2c.try_lock():
+            pass
+        try:
+            for addr in names:
+                if not _identify_locked(i2c, addr, regid, buf):
+                    problems[addr] = "no response"
+                elif buf[0] != dev_id:
+                    problems[addr] = f"device ID {buf[0]:02x}, not {dev_id:02x}"
+        finally:
+            i2c.unlock()
+    buttons = [
+        button_class(i2c, addr, dev_id, name, probe=False, **kwargs)
+        for addr, name in names.items()
+        if addr not in problems
+    ]
+    if problems:
+        raise BuildError(problems, buttons)
+    return buttons
@@ -0,0 +1,196 @@
+# SPDX-FileCopyrightText: Copyright (c) 2021 Greg Paris
+#
+# SPDX-License-Identifier: MIT
+"""
+`i2c_button.gestures`
+================================================================================
+
+Clicks, double-clicks, long presses and hold-repeat.
+
+Telling these apart by sampling :attr:`~i2c_button.I2C_Button.status` means
+polling fast enough to time each press on the host. A :class:`GestureRecognizer`
+instead times them with the button's own press and click times: when a sweep
+finds a button's status changed, it reads how long ago the button was pressed
+and released, so a press is measured just as well at a leisurely poll rate.
+A sweep that finds nothing changed reads only the status.
+
+.. code-block:: python
+
+    gestures = GestureRecognizer(buttons, double_ms=300, long_ms=800, repeat_ms=200)
+    while True:
+        for button, kind, ms in gestures.poll():
+            if kind == DOUBLE_CLICK:
+                ...
+        time.sleep(0.1)
+
+The poll interval must be shorter than **double_ms**, and than the gap between
+the clicks of a double-click, as the button remembers only its latest press and
+click. Each gesture is reported once its kind is certain: a click only when
+**double_ms** has passed with no second press.
+"""
+
+# imports
+from collections import namedtuple
+from i2c_button import _BS_CLICKED, _BS_EVENT, _BS_PRESSED
+from i2c_button import _by_bus, _decode, _read_block_locked, _read_locked
+from i2c_button import _write_locked
+from i2c_button.ring import _ticks_ms
+
+#: Gesture kind: pressed and released, and not again soon after.
+CLICK = 1
+#: Gesture kind: clicked twice within **double_ms**.
+DOUBLE_CLICK = 2
+#: Gesture kind: held down for **long_ms**.
+LONG_PRESS = 3
+#: Gesture kind: still held, another **repeat_ms** after the long press.
+REPEAT = 4
+
+#: A gesture of a button, of a **kind** above, completed **ms** milliseconds ago.
+Gesture = namedtuple("Gesture", ("button", "kind", "ms"))
+
+_TICKS = (1 << 29) - 1  # timestamps wrap as supervisor.ticks_ms does
+_TIMES_LEN = 0x15 - 0x08  # last_press_ms through last_click_ms
+
+
+def _diff(later, earlier):
+    return (later - earlier) & _TICKS
+
+
+class _Track:
+    # pylint: disable=too-few-public-methods
+    """Where one button is in its gestures. Times are in clock milliseconds."""
+
+    __slots__ = ("status", "down", "down_at", "fired", "pending", "up_at")
+
+    def __init__(self):
+        self.status = 0  # BUTTON_STATUS left after the last sweep
+        self.down = False  # a press is being timed
+        self.down_at = 0
+        self.fired = 0  # long press and repeats reported for this press
+        self.pending = False  # a click awaiting a possible second one
+        self.up_at = 0
+
+
+class GestureRecognizer:
+    """Gesture state machines for a set of buttons.
+
+    :param buttons: a :class:`~i2c_button.ButtonBank` or iterable of
+        :class:`~i2c_button.I2C_Button`
+    :param double_ms: longest gap between the clicks of a double-click
+    :param long_ms: shortest hold that is a long press rather than a click
+    :param repeat_ms: interval of :data:`REPEAT` gestures while a long press is
+        held; 0 for none
+    :param clock_ms: function returning the time in integer milliseconds;
+        by default ``supervisor.ticks_ms`` where available
+
+    The recognizer clears the status of the buttons, so don't mix it with other
+    ways of reading events from the same buttons.
+    """
+
+    def __init__(self, buttons, double_ms=300, long_ms=800, repeat_ms=0, clock_ms=None):
+        # pylint: disable=too-many-arguments
+        self.buttons = list(buttons)
+        self.double_ms = double_ms
+        self.long_ms = long_ms
+        self.repeat_ms = repeat_ms
+        self.clock_ms = _ticks_ms if clock_ms is None else clock_ms
+        self._groups = [
+            [(button, _Track()) for button in group] for group in _by_bus(self.buttons)
+        ]
+        self._times = bytearray(_TIMES_LEN)
+
+    def poll(self):
+        """Sweep the buttons once. Return a list of :class:`Gesture` completed.
+
+        Each bus is locked once. A button's press and click times are read, in
+        one transaction, only when its status differs from what the last sweep
+        left, and its status is then cleared.
+        """
+        found = []
+        times = self._times
+        for group in self._groups:
+            with group[0][0].device:
+                for button, track in group:
+                    status = _read_locked(button, 0x03)
+                    now = self.clock_ms() & _TICKS
+                    if status != track.status:
+                        _read_block_locked(button, 0x08, times)
+                        self._changed(button, track, status, now, found)
+                        if status & (_BS_EVENT | _BS_CLICKED):
+                            _write_locked(button, 0x03, 0)
+                        track.status = status & _BS_PRESSED
+                    if track.down:
+                        self._hold(button, track, track.down_at, now, now, found)
+                    elif track.pending and _diff(now, track.up_at) > self.double_ms:
+                        track.pending = False
+                        found.append(Gesture(button, CLICK, _diff(now, track.up_at)))
+        return found
+
+    def _changed(self, button, track, status, now, found):
+        """Act on a new status, with the press and click times just read."""
+        # pylint: disable=too-many-arguments
+        pressed_at = (now - _decode(self._times, 0, 4)) & _TICKS
+        if status & _BS_CLICKED:
+            released_at = (now - _decode(self._times, 0x11 - 0x08, 4)) & _TICKS
+            again = status & _BS_PRESSED and _diff(now, pressed_at) < _diff(
+                now, released_at
+            )
+            if not again:
+                down_at = pressed_at
+            elif track.down:
+                down_at = track.down_at
+            else:  # pressed, released and pressed again since the last sweep
+                down_at = released_at
+            self._release(button, track, down_at, released_at, now, found)
+            if again:
+                self._press(button, track, pressed_at, now, found)
+        elif status & _BS_PRESSED and not track.down:
+            self._press(button, track, pressed_at, now, found)
+
+    def _flush(self, button, track, down_at, now, found):
+        """Report a pending click, if a press at **down_at** can't make it double."""
+        # pylint: disable=too-many-arguments
+        if track.pending and _diff(down_at, track.up_at) > self.double_ms:
+            track.pending = False
+            found.append(Gesture(button, CLICK, _diff(now, track.up_at)))
+
+    def _press(self, button, track, down_at, now, found):
+        # pylint: disable=too-many-arguments
+        self._flush(button, track, down_at, now, found)
+        track.down = True
+        track.down_at = down_at
+        track.fired = 0
+
+    def _release(self, button, track, down_at, up_at, now, found):
+        # pylint: disable=too-many-arguments
+        self._flush(button, track, down_at, now, found)
+        self._hold(button, track, down_at, up_at, now, found)
+        track.down = False
+        if _diff(up_at, down_at) >= self.long_ms:
+            return  # reported as a long press
+        if track.pending:
+            track.pending = False
+            found.append(Gesture(button, DOUBLE_CLICK, _diff(now, up_at)))
+        else:
+            track.pending = True
+            track.up_at = up_at
+
+    def _hold(self, button, track, down_at, until, now, found):
+        """Report the long press and repeats due, of a press held **until**."""
+        # pylint: disable=too-many-arguments
+        held = _diff(until, down_at)
+        if held < self.long_ms:
+            return
+        long_at = down_at + self.long_ms
+        if not track.fired:
+            if track.pending:  # the first of two clicks, after all
+                track.pending = False
+                found.append(Gesture(button, CLICK, _diff(now, track.up_at)))
+            track.fired = 1
+            found.append(Gesture(button, LONG_PRESS, _diff(now, long_at)))
+        if self.repeat_ms:
+            due = 1 + (held - self.long_ms) // self.repeat_ms
+            while track.fired < due:
+                repeat_at = long_at + track.fired * self.repeat_ms
+                track.fired += 1
+                found.append(Gesture(button, REPEAT, _diff(now, repeat_at)))
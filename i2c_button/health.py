@@ -0,0 +1,212 @@
+# SPDX-FileCopyrightText: Copyright (c) 2021 Greg Paris
+#
+# SPDX-License-Identifier: MIT
+"""
+`i2c_button.health`
+================================================================================
+
+Keep polling when some buttons stop answering.
+
+An ``OSError`` from one unplugged button ends a :meth:`~i2c_button.ButtonBank.poll`
+sweep for every button after it. A :class:`GuardedBank` sweeps the same way, but
+retries a failed transaction a few times and, once a button has failed often
+enough, stops talking to it for a while (its circuit is *open*). After the
+cool-down, one attempt is let through (*half-open*); if it succeeds the button
+is back (*closed*), otherwise the cool-down starts over. So a dead button costs
+one failed transaction per cool-down, instead of retries in every sweep.
+
+.. code-block:: python
+
+    bank = GuardedBank(buttons, cooldown=10.0)
+    while True:
+        for event in bank.events():
+            print(event.button.name, event.ms)
+        for button in bank.unhealthy():
+            print(button.name, bank.health(button))
+"""
+
+# imports
+from collections import namedtuple
+import time
+from i2c_button import ButtonError
+from i2c_button import _by_bus, _events_locked, _read_locked
+
+#: Circuit state: the button is answering.
+CLOSED = 0
+#: Circuit state: the button failed too often, and is left alone for a while.
+OPEN = 1
+#: Circuit state: the cool-down is over, and the next attempt decides.
+HALF_OPEN = 2
+
+#: Health of a button: circuit **state**, consecutive **failures**, total
+#: **errors** and the time the circuit last **opened** (or None).
+Health = namedtuple("Health", ("state", "failures", "errors", "opened"))
+
+
+class _Circuit:
+    # pylint: disable=too-few-public-methods
+    """The circuit breaker of one button."""
+
+    __slots__ = ("state", "failures", "errors", "opened")
+
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0  # consecutive failed attempts
+        self.errors = 0  # failed attempts, in all
+        self.opened = None  # clock time the circuit last opened
+
+
+class GuardedBank:
+    """A :class:`~i2c_button.ButtonBank` that isolates failing buttons.
+
+    :param buttons: iterable of :class:`~i2c_button.I2C_Button`
+    :param retries: further attempts after a failed one
+    :param backoff: seconds to wait before the first retry; doubled for each one after
+    :param threshold: consecutive failed attempts that open the circuit
+    :param cooldown: seconds the circuit stays open
+    :param clock: object with ``monotonic()`` and ``sleep()``, such as a
+        :class:`~i2c_button.simulator.SimClock`; the :mod:`time` module by default
+
+    A retry waits with the bus still locked, so keep **retries** and **backoff**
+    small: the longest a sweep can spend on one button is about
+    **backoff** × 2 ** **retries**.
+    """
+
+    def __init__(
+        self, buttons, retries=2, backoff=0.001, threshold=3, cooldown=5.0, clock=time
+    ):
+        # pylint: disable=too-many-arguments
+        self.buttons = list(buttons)
+        self.retries = retries
+        self.backoff = backoff
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        #: Raw BUTTON_STATUS of each button, as of the last :meth:`poll`; 0 for
+        #: a button that did not answer. (bytearray; same order as **buttons**)
+        self.flags = bytearray(len(self.buttons))
+        #: Retries made, in all.
+        self.retried = 0
+        index = {id(button): i for i, button in enumerate(self.buttons)}
+        self._index = index
+        self._groups = [
+            [(index[id(button)], button) for button in group]
+            for group in _by_bus(self.buttons)
+        ]
+        self._circuits = [_Circuit() for _ in self.buttons]
+
+    def __iter__(self):
+        return iter(self.buttons)
+
+    def __len__(self):
+        return len(self.buttons)
+
+    def health(self, button):
+        """Health of **button**, as a :class:`Health` tuple."""
+        circuit = self._circuits[self._index[id(button)]]
+        return Health(circuit.state, circuit.failures, circuit.errors, circuit.opened)
+
+    def unhealthy(self):
+        """Buttons whose circuit is not closed."""
+        return [
+            button
+            for button, circuit in zip(self.buttons, self._circuits)
+            if circuit.state != CLOSED
+        ]
+
+    def reset(self, button=None):
+        """Close the circuit of **button**, or of every button, and zero its counts."""
+        if button is None:
+            indexes = range(len(self.buttons))
+        else:
+            indexes = (self._index[id(button)],)
+        for i in indexes:
+            self._circuits[i] = _Circuit()
+
+    def _admit(self, i):
+        """Whether button **i** may be talked to now."""
+        circuit = self._circuits[i]
+        if circuit.state != OPEN:
+            return True
+        if self.clock.monotonic() - circuit.opened < self.cooldown:
+            return False
+        circuit.state = HALF_OPEN
+        return True
+
+    def _attempt(self, i, func, *args):
+        """Return **func(*args)**, retrying as configured. Updates health."""
+        circuit = self._circuits[i]
+        tries = 1 if circuit.state == HALF_OPEN else 1 + self.retries
+        delay = self.backoff
+        while True:
+            try:
+                result = func(*args)
+            except OSError:
+                circuit.errors += 1
+                circuit.failures += 1
+                if circuit.state == HALF_OPEN or circuit.failures >= self.threshold:
+                    circuit.state = OPEN
+                    circuit.opened = self.clock.monotonic()
+                    raise
+                tries -= 1
+                if not tries:
+                    raise
+                self.retried += 1
+                self.clock.sleep(delay)
+                delay *= 2
+            else:
+                circuit.state = CLOSED
+                circuit.failures = 0
+                return result
+
+    def call(self, button, func, *args):
+        """Return **func(*args)** as a guarded operation of **button**.
+
+        For example, ``bank.call(button, button.set_led, 255)``.
+
+        :raises ButtonError: if the circuit of **button** is open
+        :raises OSError: if the attempts failed
+        """
+        i = self._index[id(button)]
+        if not self._admit(i):
+            raise ButtonError(f"button {button.name} is not being talked to")
+        return self._attempt(i, func, *args)
+
+    def poll(self):
+        """Read the status of every admitted button. Return those with non-zero status.
+
+        A button that fails is left out, with its **flags** entry 0.
+        """
+        flags = self.flags
+        active = []
+        for group in self._groups:
+            with group[0][1].device:
+                for i, button in group:
+                    flags[i] = 0
+                    if not self._admit(i):
+                        continue
+                    try:
+                        flags[i] = self._attempt(i, _read_locked, button, 0x03)
+                    except OSError:
+                        continue
+                    if flags[i]:
+                        active.append(button)
+        return active
+
+    def events(self):
+        """Sweep the admitted buttons once. Return a list of new events.
+
+        As :meth:`~i2c_button.ButtonBank.events`. A failed button's events are
+        left for a later sweep: a retry starts again with reading its status.
+        """
+        found = []
+        for group in self._groups:
+            with group[0][1].device:
+                for i, button in group:
+                    if not self._admit(i):
+                        continue
+                    try:
+                        found.extend(self._attempt(i, _events_locked, button))
+                    except OSError:
+                        continue
+        return found
@@ -0,0 +1,75 @@
+# SPDX-FileCopyrightText: Copyright (c) 2021 Greg Paris
+#
+# SPDX-License-Identifier: MIT
+"""
+`i2c_button.interrupts`
+================================================================================
+
+Talk to the buttons only when one of them has something to say.
+
+Each button can pull its INT pin low on a click or a press (see
+:meth:`~i2c_button.I2C_Button.set_on_click`). Wire the INT pins together to
+one host input, and an :class:`InterruptDispatcher` reads the buttons only
+while that line is asserted.
+"""
+
+# imports
+from i2c_button import ButtonBank
+
+
+class InterruptDispatcher:
+    """Sweep buttons only when their shared interrupt line is asserted.
+
+    :param buttons: a :class:`~i2c_button.ButtonBank` or iterable of
+        :class:`~i2c_button.I2C_Button`
+    :param pin: the host input wired to the buttons' INT pins; anything with a
+        boolean **value**, such as a pulled-up ``digitalio.DigitalInOut``
+    :param callback: if given, called with each event found
+    :param active_low: whether the line is asserted when **pin.value** is False
+
+    The INT pins are open-drain, so any number of buttons can share one line.
+    While it is not asserted, :meth:`check` costs no I2C traffic at all.
+
+    .. code-block:: python
+
+        pin = digitalio.DigitalInOut(board.D5)
+        pin.pull = digitalio.Pull.UP
+        dispatcher = InterruptDispatcher(buttons, pin, callback=print)
+        dispatcher.enable()
+        while True:
+            dispatcher.check()
+    """
+
+    def __init__(self, buttons, pin, callback=None, active_low=True):
+        if not isinstance(buttons, ButtonBank):
+            buttons = ButtonBank(buttons)
+        self.bank = buttons
+        self.pin = pin
+        self.callback = callback
+        self.active_low = active_low
+
+    def enable(self, on_click=True, on_press=True):
+        """Configure the interrupts of every button, then clear their status
+        so that no stale event holds the line asserted."""
+        for button in self.bank:
+            button.set_on_click(on_click)
+            button.set_on_press(on_press)
+        self.bank.clear_all()
+
+    @property
+    def asserted(self):
+        """Whether the interrupt line is asserted. (read-only)"""
+        return self.pin.value != self.active_low
+
+    def check(self):
+        """If the line is asserted, sweep the buttons. Return the events found.
+
+        Sweeping clears each button's status, which releases the line.
+        """
+        if not self.asserted:
+            return []
+        found = self.bank.events()
+        if self.callback is not None:
+            for event in found:
+                self.callback(event)
+        return found
@@ -0,0 +1,221 @@
+# SPDX-FileCopyrightText: Copyright (c) 2021 Greg Paris
+#
+# SPDX-License-Identifier: MIT
+"""
+`i2c_button.monitor`
+================================================================================
+
+Per-button, per-register accounting of I2C traffic.
+
+A :class:`BusMonitor` stands between the buttons attached to it and their
+``I2CDevice``, counting transactions, bytes, errors and time spent, and calling
+any hooks you add. Buttons not attached are untouched, so when nothing is
+attached the cost is exactly nothing.
+
+.. code-block:: python
+
+    monitor = BusMonitor()
+    monitor.attach(buttons)
+    ...
+    for button, stats in monitor.stats().items():
+        print(button.name, stats.transactions, stats.max_ns)
+"""
+
+# imports
+from collections import namedtuple
+import time
+
+try:
+    _now_ns = time.monotonic_ns
+except AttributeError:  # boards without long integers
+
+    def _now_ns():
+        return int(time.monotonic() * 1000000000)
+
+
+#: Traffic counts for a button, or one of its registers.
+#: (**registers** is a dict of register number to **Stats** for a button, None
+#: for a register.) A transaction's register is the first byte it writes.
+Stats = namedtuple(
+    "Stats", ("transactions", "bytes", "errors", "total_ns", "max_ns", "registers")
+)
+
+# indexes into counter lists
+_TXN = 0
+_BYTES = 1
+_ERRS = 2
+_TOTAL = 3
+_MAX = 4
+
+
+def _count(counter, n_bytes, elapsed, failed):
+    counter[_TXN] += 1
+    counter[_BYTES] += n_bytes
+    if failed:
+        counter[_ERRS] += 1
+    counter[_TOTAL] += elapsed
+    if elapsed > counter[_MAX]:
+        counter[_MAX] = elapsed
+
+
+class _MonitoredDevice:
+    """Stands in for a button's ``I2CDevice`` while it is monitored."""
+
+    def __init__(self, button, device, monitor):
+        self.button = button
+        self.inner = device
+        self.monitor = monitor
+        self.i2c = device.i2c
+        self.device_address = device.device_address
+
+    def __enter__(self):
+        self.inner.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return self.inner.__exit__(exc_type, exc_val, exc_tb)
+
+    def write(self, buf, *, start=0, end=None):
+        """As ``I2CDevice.write``, accounted."""
+        if end is None:
+            end = len(buf)
+        register = buf[start] if end > start else None
+        self.monitor.transact(
+            self.button,
+            register,
+            end - start,
+            self.inner.write,
+            buf,
+            start=start,
+            end=end,
+        )
+
+    def readinto(self, buf, *, start=0, end=None):
+        """As ``I2CDevice.readinto``, accounted."""
+        if end is None:
+            end = len(buf)
+        self.monitor.transact(
+            self.button,
+            None,
+            end - start,
+            self.inner.readinto,
+            buf,
+            start=start,
+            end=end,
+        )
+
+    def write_then_readinto(
+        self,
+        out_buffer,
+        in_buffer,
+        *,
+        out_start=0,
+        out_end=None,
+        in_start=0,
+        in_end=None,
+    ):
+        """As ``I2CDevice.write_then_readinto``, accounted."""
+        # pylint: disable=too-many-arguments
+        if out_end is None:
+            out_end = len(out_buffer)
+        if in_end is None:
+            in_end = len(in_buffer)
+
+        self.monitor.transact(
+            self.button,
+            out_buffer[out_start] if out_end > out_start else None,
+            out_end - out_start + in_end - in_start,
+            self.inner.write_then_readinto,
+            out_buffer,
+            in_buffer,
+            out_start=out_start,
+            out_end=out_end,
+            in_start=in_start,
+            in_end=in_end,
+        )
+
+
+class BusMonitor:
+    """Traffic accounting and hooks for a set of :class:`~i2c_button.I2C_Button`.
+
+    :param buttons: buttons to :meth:`attach` right away
+
+    Hooks are called around every transaction of an attached button:
+    each of **pre_hooks** as ``hook(button, register)`` and each of
+    **post_hooks** as ``hook(button, register, n_bytes, elapsed_ns, error)``,
+    where **error** is the ``OSError`` raised, if any, else None.
+    """
+
+    def __init__(self, buttons=()):
+        self.pre_hooks = []
+        self.post_hooks = []
+        self._buttons = {}  # id(button) -> button
+        self._counts = {}  # id(button) -> counter list
+        self._registers = {}  # id(button) -> {register: counter list}
+        self.attach(buttons)
+
+    def attach(self, buttons):
+        """Start monitoring a button, or an iterable of them."""
+        if not isinstance(buttons, (list, tuple)) and hasattr(buttons, "device"):
+            buttons = (buttons,)
+        for button in buttons:
+            if id(button) in self._buttons:
+                continue
+            self._buttons[id(button)] = button
+            button.device = _MonitoredDevice(button, button.device, self)
+        self._zero(self._buttons)
+
+    def detach(self, buttons):
+        """Stop monitoring a button, or an iterable of them, and forget its stats."""
+        if not isinstance(buttons, (list, tuple)) and hasattr(buttons, "device"):
+            buttons = (buttons,)
+        for button in buttons:
+            if self._buttons.pop(id(button), None) is not None:
+                button.device = button.device.inner
+                del self._counts[id(button)]
+                del self._registers[id(button)]
+
+    def _zero(self, keys):
+        for key in keys:
+            self._counts.setdefault(key, [0, 0, 0, 0, 0])
+            self._registers.setdefault(key, {})
+
+    def reset(self):
+        """Zero all counters."""
+        self._counts.clear()
+        self._registers.clear()
+        self._zero(self._buttons)
+
+    def transact(self, button, register, n_bytes, func, *args, **kwargs):
+        """Perform **func(*args, **kwargs)** as an accounted transaction of **button**."""
+        # pylint: disable=too-many-arguments
+        for hook in self.pre_hooks:
+            hook(button, register)
+        error = None
+        start = _now_ns()
+        try:
+            func(*args, **kwargs)
+        except OSError as exc:
+            error = exc
+            raise
+        finally:
+            elapsed = _now_ns() - start
+            _count(self._counts[id(button)], n_bytes, elapsed, error)
+            registers = self._registers[id(button)]
+            counter = registers.get(register)
+            if counter is None:
+                counter = registers[register] = [0, 0, 0, 0, 0]
+            _count(counter, n_bytes, elapsed, error)
+            for hook in self.post_hooks:
+                hook(button, register, n_bytes, elapsed, error)
+
+    def stats(self):
+        """Snapshot of the counters: a dict of button to :class:`Stats`."""
+        result = {}
+        for key, button in self._buttons.items():
+            registers = {
+                register: Stats(*counter, None)
+                for register, counter in self._registers[key].items()
+            }
+            result[button] = Stats(*self._counts[key], registers)
+        return result
@@ -0,0 +1,154 @@
+# SPDX-FileCopyrightText: Copyright (c) 2021 Greg Paris
+#
+# SPDX-License-Identifier: MIT
+"""
+`i2c_button.mux`
+================================================================================
+
+Buttons behind a TCA9548A I2C multiplexer.
+
+Buttons have only a handful of addresses to choose from, so larger panels put
+them behind multiplexers. Each channel of a :class:`TCA9548A` acts as an I2C
+bus of its own, and a channel is selected only when the multiplexer is not
+already set to it, rather than every time the bus is locked.
+
+Since a :class:`~i2c_button.ButtonBank` locks each bus once per sweep, a bank
+of buttons spread over channels selects each channel at most once per sweep:
+
+.. code-block:: python
+
+    mux = TCA9548A(i2c)
+    buttons = mux_buttons(mux, [(0, 0x6F), (0, 0x6E), (1, 0x6F), (2, 0x6F)])
+    bank = ButtonBank(buttons)
+    bank.poll()  # three channel selections, four status reads
+
+To look for buttons on the parent bus itself, leave the multiplexer out of the
+scan, since writing it deselects every channel behind the :class:`TCA9548A`'s
+back. Buttons on a selected channel answer on the parent bus too, so do this
+before any channel is selected:
+
+.. code-block:: python
+
+    buttons = discover(i2c, exclude=(mux.address,))
+
+If something else has written the multiplexer, call :meth:`TCA9548A.invalidate`.
+"""
+
+# imports
+from i2c_button import I2C_Button
+
+_DEF_MUX_ADDR = 0x70
+_N_CHANNELS = 8
+
+
+class MuxChannel:
+    """One channel of a :class:`TCA9548A`, with the interface of ``busio.I2C``.
+
+    Locking the channel locks the parent bus and, if need be, selects the channel.
+    """
+
+    def __init__(self, mux, channel):
+        self.mux = mux
+        self.channel = channel
+        self.mask = 1 << channel
+
+    def try_lock(self):
+        """Lock the parent bus and select this channel."""
+        mux = self.mux
+        if not mux.i2c.try_lock():
+            return False
+        if mux.selected != self.mask:
+            try:
+                mux.select(self.mask)
+            except OSError:
+                mux.i2c.unlock()
+                raise
+        return True
+
+    def unlock(self):
+        """Release the parent bus. The channel stays selected."""
+        self.mux.i2c.unlock()
+
+    def scan(self):
+        """Addresses responding on this channel, not counting the multiplexer."""
+        return [addr for addr in self.mux.i2c.scan() if addr != self.mux.address]
+
+    def writeto(self, address, buffer, **kwargs):
+        """As ``busio.I2C.writeto``."""
+        self.mux.i2c.writeto(address, buffer, **kwargs)
+
+    def readfrom_into(self, address, buffer, **kwargs):
+        """As ``busio.I2C.readfrom_into``."""
+        self.mux.i2c.readfrom_into(address, buffer, **kwargs)
+
+    def writeto_then_readfrom(self, address, out_buffer, in_buffer, **kwargs):
+        """As ``busio.I2C.writeto_then_readfrom``."""
+        self.mux.i2c.writeto_then_readfrom(address, out_buffer, in_buffer, **kwargs)
+
+    def __repr__(self):
+        return "%s(%s, %d)" % (self.__class__.__name__, repr(self.mux), self.channel)
+
+
+class TCA9548A:
+    """TCA9548A 8-channel I2C multiplexer.
+
+    :param i2c: initialized I2C object
+    :param address: I2C address of the multiplexer
+
+    Index it by channel number for that channel's bus, e.g. ``mux[3]``.
+
+    The multiplexer's selection is remembered, so if anything else talks to the
+    multiplexer, call :meth:`invalidate` afterward.
+    """
+
+    def __init__(self, i2c, address=_DEF_MUX_ADDR):
+        self.i2c = i2c
+        self.address = address
+        #: Channel mask last written, or None if unknown.
+        self.selected = None
+        #: Number of channel selections written.
+        self.selections = 0
+        self._buf = bytearray(1)
+        self._channels = tuple(MuxChannel(self, n) for n in range(_N_CHANNELS))
+
+    def __getitem__(self, channel):
+        return self._channels[channel]
+
+    def __len__(self):
+        return _N_CHANNELS
+
+    def select(self, mask):
+        """Write the channel selection mask. The parent bus must be locked."""
+        self.selected = None
+        self._buf[0] = mask
+        self.i2c.writeto(self.address, self._buf)
+        self.selected = mask
+        self.selections += 1
+
+    def invalidate(self):
+        """Forget the selection, so the next lock of a channel selects it."""
+        self.selected = None
+
+    def __repr__(self):
+        return "%s(%s, address=%s)" % (
+            self.__class__.__name__,
+            repr(self.i2c),
+            hex(self.address),
+        )
+
+
+def mux_buttons(mux, addresses, **kwargs):
+    """Create buttons addressed by (channel, I2C address).
+
+    :param mux: a :class:`TCA9548A`
+    :param addresses: iterable of (channel, I2C address)
+    :param kwargs: passed on to :class:`~i2c_button.I2C_Button`
+    :return: list of :class:`~i2c_button.I2C_Button`, in the order given,
+        named "channel:address"
+
+    Given in channel order, construction too selects each channel only once.
+    """
+    return [
+        I2C_Button(mux[channel], addr, name=f"{channel}:{addr:02x}", **kwargs)
+        for channel, addr in addresses
+    ]
@@ -0,0 +1,34 @@
+# SPDX-FileCopyrightText: Copyright (c) 2021 Greg Paris
+#
+# SPDX-License-Identifier: MIT
+"""
+`i2c_button.ordering`
+================================================================================
+
+Sorting and description for :class:`~i2c_button.LeanButton`.
+
+An :class:`~i2c_button.I2C_Button` sorts, hashes and prints itself by name and
+I2C address. A :class:`~i2c_button.LeanButton` leaves that out to save memory;
+when it is wanted after all, import this module for the same ordering and text.
+
+.. code-block:: python
+
+    buttons.sort(key=sort_key)
+    print(describe(buttons[0]))
+"""
+
+# imports
+from i2c_button import _describe
+
+
+def sort_key(button):
+    """The (name, I2C address) an :class:`~i2c_button.I2C_Button` sorts by."""
+    return (button.name, button.device.device_address)
+
+
+def describe(button):
+    """The text an :class:`~i2c_button.I2C_Button` would give as its ``repr``.
+
+    Reads the button's I2C address and device ID registers, unless cached.
+    """
+    return _describe(button)
@@ -0,0 +1,199 @@
+# SPDX-FileCopyrightText: Copyright (c) 2021 Greg Paris
+#
+# SPDX-License-Identifier: MIT
+"""
+`i2c_button.provision`
+================================================================================
+
+Commission a panel of buttons: give each its address and configuration.
+
+Every new button answers at the default address, 0x6F, so new buttons have to
+be connected one at a time and moved out of the way. A :class:`Provisioner` is
+given the addresses the buttons should end up at, in order, and the
+configuration they should all have. It moves each new button it finds at the
+default address to the next address still unoccupied, writes only the
+registers that differ from the plan, and verifies them with one block read.
+
+.. code-block:: python
+
+    provisioner = Provisioner(i2c, range(0x10, 0x38), debounce_ms=20, led_bright=0)
+
+    def connect(addr):
+        return input(f"connect the button for {addr:#x}, or q to stop: ") != "q"
+
+    for result in provisioner.run(connect):
+        print(hex(result.address), result.outcome, result.detail)
+
+Nothing is remembered between runs but what is on the bus, so after a failure
+or an interruption, just run again. Buttons already at their addresses are only
+checked (one transaction each), or configured if they need it.
+"""
+
+# imports
+from collections import namedtuple
+from i2c_button import _DEF_ADDR, _DEV_ID, _MAP_LEN, ButtonError, LeanButton
+from i2c_button import _decode, _mask, _plan, _read_block_locked
+from i2c_button import _verify_locked, _write_locked, _write_run_locked
+from i2c_button.discovery import _identify_locked
+
+#: Outcome: the button was already as planned; nothing was written.
+OK = "ok"
+#: Outcome: the button was at its address, and some registers were written.
+CONFIGURED = "configured"
+#: Outcome: a new button was moved here from the default address, and configured.
+ASSIGNED = "assigned"
+#: Outcome: no button could be had for this address.
+MISSING = "missing"
+#: Outcome: something went wrong; see **detail**.
+FAILED = "failed"
+
+#: What became of one address of the plan: the **address**, an **outcome**
+#: above, the number of register **writes** made and any **detail**.
+Provisioned = namedtuple("Provisioned", ("address", "outcome", "writes", "detail"))
+
+_MIN_ADDR = 0x08  # the firmware accepts addresses 0x08 through 0x77
+_MAX_ADDR = 0x77
+
+
+class Provisioner:
+    """Assign addresses and configuration to buttons, per a plan.
+
+    :param i2c: initialized I2C object
+    :param addrs: addresses the buttons should have, in the order to assign them
+    :param default_addr: address at which new buttons answer
+    :param dev_id: Device ID of the buttons
+    :param config: read-write register property names and values, as for
+        :meth:`~i2c_button.I2C_Button.configure`
+    :raises ValueError: if an address is out of range, repeated, or the default
+    :raises AttributeError: if **config** names something not configurable
+    """
+
+    def __init__(self, i2c, addrs, default_addr=_DEF_ADDR, dev_id=_DEV_ID, **config):
+        self.i2c = i2c
+        self.addrs = list(addrs)
+        self.default_addr = default_addr
+        self.dev_id = dev_id
+        if len(set(self.addrs)) != len(self.addrs):
+            raise ValueError("addresses repeated")
+        for addr in self.addrs:
+            if not _MIN_ADDR <= addr <= _MAX_ADDR or addr == default_addr:
+                raise ValueError(f"cannot assign address {addr:02x}")
+        self._runs = _plan(config)
+        self._map = bytearray(_MAP_LEN)
+
+    def survey(self):
+        """What answers at the planned and the default addresses now.
+
+        Returns a dict of address to the Device ID read there, or None where
+        nothing answers. All are read under a single bus lock.
+        """
+        return self._present(self.addrs + [self.default_addr])
+
+    def _present(self, addrs):
+        regid = bytearray(1)
+        buf = bytearray(3)
+        present = {}
+        while not self.i2c.try_lock():
+            pass
+        try:
+            for addr in addrs:
+                if _identify_locked(self.i2c, addr, regid, buf):
+                    present[addr] = buf[0]
+                else:
+                    present[addr] = None
+        finally:
+            self.i2c.unlock()
+        return present
+
+    def _waiting(self):
+        """Whether a button answers at the default address."""
+        return self._present([self.default_addr])[self.default_addr] == self.dev_id
+
+    def setup(self, addr):
+        """Bring the button at **addr** to the planned configuration.
+
+        The register map is read in one transaction; each group of adjacent
+        registers that differs from the plan is written in one more; and if any
+        were, they are read back in one more.
+
+        :return: a :class:`Provisioned`
+        """
+        button = LeanButton(self.i2c, addr, self.dev_id, probe=False)
+        buf = self._map
+        writes = 0
+        try:
+            with button.device:
+                _read_block_locked(button, 0x00, buf)
+                if buf[0x00] != self.dev_id:
+                    return Provisioned(addr, FAILED, 0, f"device ID {buf[0x00]:02x}")
+                if buf[0x1F] != addr:
+                    return Provisioned(
+                        addr, FAILED, 0, f"reports address {buf[0x1F]:02x}"
+                    )
+                todo = [run for run in self._runs if not self._holds(run)]
+                for run in todo:
+                    _write_run_locked(button, run)
+                    writes += 1
+                if todo:
+                    _verify_locked(button, todo)
+        except (OSError, ButtonError) as exc:
+            return Provisioned(addr, FAILED, writes, str(exc))
+        return Provisioned(addr, CONFIGURED if writes else OK, writes, None)
+
+    def _holds(self, run):
+        """Whether the register map just read already holds the values of **run**."""
+        for register, n_bytes, value in run:
+            if _decode(self._map, register, n_bytes) != _mask(value, n_bytes):
+                return False
+        return True
+
+    def assign(self, addr):
+        """Move the button at the default address to **addr**, and set it up.
+
+        :return: a :class:`Provisioned`
+        """
+        button = LeanButton(self.i2c, self.default_addr, self.dev_id, probe=False)
+        try:
+            with button.device:
+                _write_locked(button, 0x1F, addr)
+        except OSError as exc:
+            return Provisioned(addr, FAILED, 0, str(exc))
+        result = self.setup(addr)
+        if result.outcome == FAILED:
+            return result
+        return Provisioned(addr, ASSIGNED, result.writes + 1, None)
+
+    def run(self, connect=None):
+        """Provision every address of the plan. Returns a list of :class:`Provisioned`.
+
+        :param connect: called as **connect(addr)** when a new button is wanted
+            for **addr** and none answers at the default address; it should have
+            one connected there and return True, or return False to give up, so
+            that this and the remaining addresses are reported :data:`MISSING`
+
+        Buttons already at planned addresses are set up first, then new ones
+        are assigned to the remaining addresses, in plan order.
+        """
+        present = self.survey()
+        results = {}
+        for addr in self.addrs:
+            if present[addr] == self.dev_id:
+                results[addr] = self.setup(addr)
+            elif present[addr] is not None:
+                detail = f"occupied by device ID {present[addr]:02x}"
+                results[addr] = Provisioned(addr, FAILED, 0, detail)
+        waiting = present[self.default_addr] == self.dev_id
+        for addr in self.addrs:
+            if addr in results:
+                continue
+            while not waiting and connect is not None:
+                if not connect(addr):
+                    connect = None
+                    break
+                waiting = self._waiting()
+            if not waiting:
+                results[addr] = Provisioned(addr, MISSING, 0, None)
+                continue
+            results[addr] = self.assign(addr)
+            waiting = self._waiting()  # a button that failed to move is still there
+        return [results[addr] for addr in self.addrs]
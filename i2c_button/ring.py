@@ -0,0 +1,178 @@
+# SPDX-FileCopyrightText: Copyright (c) 2021 Greg Paris
+#
+# SPDX-License-Identifier: MIT
+"""
+`i2c_button.ring`
+================================================================================
+
+Host-side, timestamped button event queue.
+
+With firmware 1.1 the button's own queues cannot be popped, so between polls
+all but the latest press and click are lost anyway; what can be done is to poll
+often and keep what each poll finds. An :class:`EventRing` does that without
+allocating memory per event: events live in preallocated arrays, and the
+relative times the button reports are turned into absolute timestamps as they
+are read.
+
+.. code-block:: python
+
+    ring = EventRing(buttons, capacity=32)
+    while True:
+        ring.poll()
+        while ring:
+            button, kind, when = ring.pop()
+"""
+
+# imports
+from array import array
+import time
+from i2c_button import _BS_CLICKED, _BS_EVENT, _BS_PRESSED
+from i2c_button import _by_bus, _read_locked, _write_locked
+
+try:
+    from supervisor import ticks_ms as _ticks_ms  # no allocation, wraps at 2**29
+except ImportError:
+    try:
+        from time import monotonic_ns
+
+        def _ticks_ms():
+            return monotonic_ns() // 1000000
+
+    except ImportError:
+
+        def _ticks_ms():
+            return int(time.monotonic() * 1000)
+
+
+#: Event kind: the button was pressed.
+EVENT_PRESS = 1
+#: Event kind: the button was clicked (pressed and released).
+EVENT_CLICK = 2
+
+#: Overflow policy: discard the oldest event to make room.
+DROP_OLDEST = 0
+#: Overflow policy: discard the new event.
+DROP_NEWEST = 1
+
+_TICKS = (1 << 29) - 1  # timestamps wrap as supervisor.ticks_ms does
+
+
+class EventRing:
+    """Fixed-capacity queue of button events, filled by polling.
+
+    :param buttons: a :class:`~i2c_button.ButtonBank` or iterable of
+        :class:`~i2c_button.I2C_Button`
+    :param capacity: most events held
+    :param policy: :data:`DROP_OLDEST` or :data:`DROP_NEWEST`, when full
+    :param clock_ms: function returning the time in integer milliseconds;
+        by default ``supervisor.ticks_ms`` where available
+
+    Each event is a button index (into **buttons**), a kind (:data:`EVENT_PRESS`
+    or :data:`EVENT_CLICK`) and a timestamp in **clock_ms** milliseconds, modulo
+    2**29. That is the period of ``supervisor.ticks_ms``, so timestamps wrap
+    with it, about every six days; take the difference of two timestamps
+    modulo 2**29, as in ``(later - earlier) & 0x1FFFFFFF``, to compare them.
+    """
+
+    def __init__(self, buttons, capacity=32, policy=DROP_OLDEST, clock_ms=None):
+        self.buttons = list(buttons)
+        self.policy = policy
+        self.clock_ms = _ticks_ms if clock_ms is None else clock_ms
+        #: Number of events discarded because the ring was full.
+        self.dropped = 0
+        index = {id(button): i for i, button in enumerate(self.buttons)}
+        self._groups = [
+            [(index[id(button)], button) for button in group]
+            for group in _by_bus(self.buttons)
+        ]
+        self._sources = array("H", bytes(2 * capacity))
+        self._kinds = bytearray(capacity)
+        self._times = array("L", [0] * capacity)
+        self._head = 0  # oldest event
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def capacity(self):
+        """Most events held. (read-only)"""
+        return len(self._kinds)
+
+    def push(self, source, kind, when):
+        """Add an event, at timestamp **when** (modulo 2**29). Returns False if
+        it was dropped."""
+        capacity = len(self._kinds)
+        if self._count == capacity:
+            self.dropped += 1
+            if self.policy == DROP_NEWEST:
+                return False
+            self._head = (self._head + 1) % capacity
+            self._count -= 1
+        i = (self._head + self._count) % capacity
+        self._sources[i] = source
+        self._kinds[i] = kind
+        self._times[i] = when & _TICKS
+        self._count += 1
+        return True
+
+    def poll(self):
+        """Sweep the buttons once, adding any events found. Returns how many.
+
+        Each bus is locked once. A button's timing register is read only when
+        its status shows the matching event, and its status is then cleared.
+        """
+        found = 0
+        clock_ms = self.clock_ms
+        for group in self._groups:
+            with group[0][1].device:
+                for source, button in group:
+                    status = _read_locked(button, 0x03)
+                    if not status & _BS_EVENT:
+                        continue
+                    if status & _BS_CLICKED:
+                        ago = _read_locked(button, 0x11, 4)
+                        found += self.push(source, EVENT_CLICK, clock_ms() - ago)
+                    if status & _BS_PRESSED:
+                        ago = _read_locked(button, 0x08, 4)
+                        found += self.push(source, EVENT_PRESS, clock_ms() - ago)
+                    _write_locked(button, 0x03, 0)
+        return found
+
+    def pop(self):
+        """Remove the oldest event and return it as (button, kind, timestamp).
+
+        :raises IndexError: if the ring is empty
+        """
+        if not self._count:
+            raise IndexError("pop from empty EventRing")
+        i = self._head
+        self._head = (i + 1) % len(self._kinds)
+        self._count -= 1
+        return self.buttons[self._sources[i]], self._kinds[i], self._times[i]
+
+    def drain(self, sources, kinds, times):
+        """Move events, oldest first, into caller-supplied buffers.
+
+        :param sources: receives button indexes, e.g. ``array("H", ...)``
+        :param kinds: receives event kinds, e.g. ``bytearray``
+        :param times: receives timestamps, e.g. ``array("L", ...)``
+        :return: number of events moved, at most the length of the shortest buffer
+
+        Nothing is allocated, so this suits a tight loop on a microcontroller.
+        """
+        capacity = len(self._kinds)
+        n_events = min(self._count, len(sources), len(kinds), len(times))
+        i = self._head
+        for j in range(n_events):
+            sources[j] = self._sources[i]
+            kinds[j] = self._kinds[i]
+            times[j] = self._times[i]
+            i = (i + 1) % capacity
+        self._head = i
+        self._count -= n_events
+        return n_events
+
+    def clear(self):
+        """Discard all events."""
+        self._head = self._count = 0
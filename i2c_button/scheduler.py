@@ -0,0 +1,64 @@
+# SPDX-FileCopyrightText: Copyright (c) 2021 Greg Paris
+#
+# SPDX-License-Identifier: MIT
+"""
+`i2c_button.scheduler`
+================================================================================
+
+Poll often while the buttons are in use, and seldom while they are not.
+
+A :class:`PollScheduler` only does arithmetic: it is told what each sweep
+found, and says how long to wait before the next. Use it with any way of
+sweeping, such as :meth:`~i2c_button.ButtonBank.poll` or
+:func:`~i2c_button.aio.button_events`.
+"""
+
+
+class PollScheduler:
+    """Adaptive polling interval for a group of buttons.
+
+    :param buttons: a :class:`~i2c_button.ButtonBank` or iterable of
+        :class:`~i2c_button.I2C_Button`
+    :param max_interval: longest interval, in seconds, reached while idle
+    :param backoff: factor by which the interval grows after each idle sweep
+
+    The shortest interval is the longest **debounce_ms** of the buttons, as there is
+    no point in polling faster than a press can be registered. Each sweep that finds
+    nothing multiplies the interval by **backoff**, up to **max_interval**; any
+    activity snaps it back to the shortest. So the bus is nearly quiet while nobody
+    is touching the buttons, and responsive while somebody is.
+
+    .. code-block:: python
+
+        scheduler = PollScheduler(bank)
+        while True:
+            time.sleep(scheduler.interval)
+            scheduler.update(bank.poll())
+    """
+
+    def __init__(self, buttons, max_interval=2.0, backoff=2.0):
+        self.buttons = buttons
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.min_interval = self.interval = 0.0
+        self.retune()
+
+    def retune(self):
+        """Rederive the shortest interval from the buttons' debounce times.
+
+        Call this after changing **debounce_ms** of any of the buttons.
+        """
+        debounce_ms = max([button.debounce_ms for button in self.buttons] + [1])
+        self.min_interval = self.interval = min(debounce_ms / 1000, self.max_interval)
+
+    def update(self, active):
+        """Adjust the interval after a sweep. Return the new interval in seconds.
+
+        :param active: whether the sweep saw activity, for example the list
+            returned by :meth:`~i2c_button.ButtonBank.poll`
+        """
+        if active:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+        return self.interval
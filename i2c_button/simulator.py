@@ -0,0 +1,465 @@
+# SPDX-FileCopyrightText: Copyright (c) 2021 Greg Paris
+#
+# SPDX-License-Identifier: MIT
+"""
+`i2c_button.simulator`
+================================================================================
+
+Simulated Qwiic Button firmware and I2C bus, for running without hardware.
+
+:class:`SimI2C` stands in for ``busio.I2C``. Add :class:`SimButton` devices to it
+and hand it to :class:`~i2c_button.I2C_Button` like any other bus:
+
+.. code-block:: python
+
+    clock = SimClock()
+    i2c = SimI2C(clock, latency=0.0002, byte_time=0.00009)  # roughly 100 kHz
+    sim = i2c.add(SimButton(0x6F))
+    button = I2C_Button(i2c)
+    sim.press()
+    clock.advance(0.2)
+    sim.release()
+    print(button.status, button.last_click_ms, i2c.transactions)
+
+The model follows the Sparkfun firmware closely enough for benchmarking and
+testing polling strategies: debouncing, status flags, press and click queues
+(including the firmware 1.1 defect that popping them has no effect), the
+timing registers, interrupt configuration and address changes. The LED
+registers are only stored. :class:`SimTCA9548A` puts buttons behind a
+multiplexer.
+
+This module is meant for desktop CPython; it is not needed on a board.
+"""
+
+# imports
+import time
+
+_ENODEV = 19  # errno raised for an address nobody answers, as CircuitPython does
+
+# BUTTON_STATUS flags
+_BS_EVENT = 0x1
+_BS_CLICKED = 0x2
+_BS_PRESSED = 0x4
+
+# INTERRUPT_CONFIG flags
+_INT_CL = 0x1
+_INT_PR = 0x2
+
+# queue status flags
+_QS_POP = 0x1
+_QS_EMPTY = 0x2
+_QS_FULL = 0x4
+
+_QUEUE_LEN = 15  # entries in each firmware queue
+_MAP_LEN = 0x20
+
+
+class SimClock:
+    """Simulated clock. Time passes only when :meth:`advance` is called.
+
+    :param start: initial time in seconds
+    """
+
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def monotonic(self):
+        """Current time in seconds."""
+        return self.now
+
+    def advance(self, seconds):
+        """Let **seconds** pass."""
+        self.now += seconds
+
+    sleep = advance
+
+
+class RealClock:
+    """Wall clock with the same interface as :class:`SimClock`.
+
+    With this clock, bus latency really is spent, sleeping.
+    """
+
+    @staticmethod
+    def monotonic():
+        """Current time in seconds."""
+        return time.monotonic()
+
+    @staticmethod
+    def advance(seconds):
+        """Let **seconds** pass."""
+        if seconds > 0:
+            time.sleep(seconds)
+
+    sleep = advance
+
+
+def _put(regs, offset, value, n_bytes):
+    """Store a little-endian integer into a register map."""
+    for i in range(offset, offset + n_bytes):
+        regs[i] = value & 0xFF
+        value >>= 8
+
+
+class SimButton:
+    """Simulated Sparkfun Qwiic Button/Switch/Arcade.
+
+    :param address: I2C address
+    :param version: firmware version as a (major, minor) tuple
+    :param dev_id: Device ID reported
+
+    Call :meth:`press` and :meth:`release` to operate the button. Times come from
+    the clock of the :class:`SimI2C` the button is added to.
+    """
+
+    def __init__(self, address=0x6F, version=(1, 1), dev_id=0x5D):
+        self.address = address
+        self.version = version
+        self.bus = None
+        self.regs = bytearray(_MAP_LEN)
+        self.regs[0x00] = dev_id
+        self.regs[0x01] = version[1]
+        self.regs[0x02] = version[0]
+        _put(self.regs, 0x05, 10, 2)  # firmware default debounce
+        self.regs[0x1F] = address
+        self.presses = []  # press queue, oldest first, times in seconds
+        self.clicks = []  # click queue
+        self._down_at = None  # time of an undebounced press
+        self._pointer = 0
+        #: Transactions still to go unanswered, as with a bad connector;
+        #: -1 to leave all unanswered, as if unplugged.
+        self.faults = 0
+
+    @property
+    def broken_queues(self):
+        """Whether popping the queues has no effect, as with firmware 1.1."""
+        return self.version == (1, 1)
+
+    def _now(self):
+        return self.bus.clock.monotonic()
+
+    def _update(self):
+        """Register a press once it has outlasted the debounce time."""
+        if self._down_at is None:
+            return
+        debounce = (self.regs[0x05] | (self.regs[0x06] << 8)) / 1000
+        if self._now() - self._down_at >= debounce:
+            self._push(self.presses, self._down_at + debounce)
+            self.regs[0x03] |= _BS_PRESSED | _BS_EVENT
+            self._down_at = None
+
+    @staticmethod
+    def _push(queue, when):
+        queue.append(when)
+        if len(queue) > _QUEUE_LEN:
+            queue.pop(0)
+
+    def press(self):
+        """Push the button down. It counts as pressed after the debounce time."""
+        self._update()
+        if self._down_at is None and not self.regs[0x03] & _BS_PRESSED:
+            self._down_at = self._now()
+            self._update()
+
+    def release(self):
+        """Let the button up, which makes a click if the press registered."""
+        self._update()
+        if self._down_at is not None:
+            self._down_at = None  # too short to be a press
+        elif self.regs[0x03] & _BS_PRESSED:
+            self._push(self.clicks, self._now())
+            self.regs[0x03] = (self.regs[0x03] & ~_BS_PRESSED) | _BS_CLICKED | _BS_EVENT
+
+    @property
+    def interrupt(self):
+        """Whether the button is pulling its INT pin low."""
+        self._update()
+        status = self.regs[0x03]
+        if not status & _BS_EVENT:
+            return False
+        config = self.regs[0x04]
+        return bool(
+            (config & _INT_CL and status & _BS_CLICKED)
+            or (config & _INT_PR and status & _BS_PRESSED)
+        )
+
+    def _materialize(self):
+        """Fill in the registers computed from the clock and queues."""
+        self._update()
+        regs = self.regs
+        now = self._now()
+        for base, queue in ((0x07, self.presses), (0x10, self.clicks)):
+            regs[base] = (_QS_EMPTY if not queue else 0) | (
+                _QS_FULL if len(queue) == _QUEUE_LEN else 0
+            )
+            newest = int((now - queue[-1]) * 1000) if queue else 0
+            oldest = int((now - queue[0]) * 1000) if queue else 0
+            _put(regs, base + 1, newest, 4)
+            _put(regs, base + 5, oldest, 4)
+        return regs
+
+    def read(self, buf, start, end):
+        """Bus read of **buf[start:end]** from the register pointer."""
+        regs = self._materialize()
+        pointer = self._pointer
+        for i in range(start, end):
+            buf[i] = regs[pointer] if pointer < _MAP_LEN else 0
+            pointer += 1
+        self._pointer = pointer
+
+    def write(self, buf, start, end):
+        """Bus write: a register pointer, then any bytes to store from there."""
+        if start == end:
+            return  # just a probe
+        self._update()
+        pointer = buf[start]
+        for i in range(start + 1, end):
+            self._store(pointer, buf[i])
+            pointer += 1
+        self._pointer = buf[start]
+
+    def _store(self, register, value):
+        regs = self.regs
+        if register == 0x03:
+            regs[register] = (value & (_BS_EVENT | _BS_CLICKED)) | (
+                regs[register] & _BS_PRESSED
+            )
+        elif register in (0x04, 0x05, 0x06) or 0x19 <= register < 0x1F:
+            regs[register] = value
+        elif register in (0x07, 0x10):
+            queue = self.presses if register == 0x07 else self.clicks
+            if value & _QS_POP and queue and not self.broken_queues:
+                queue.pop(0)
+        elif register == 0x1F and 0x08 <= value <= 0x77:
+            regs[register] = value
+            self.address = value
+            if self.bus is not None:
+                self.bus.readdress(self)
+        # everything else is read-only
+
+
+class SimTCA9548A:
+    """Simulated TCA9548A I2C multiplexer.
+
+    :param address: I2C address
+
+    Add it to a :class:`SimI2C`, then add devices behind it with :meth:`add`.
+    Devices on the selected channels answer on the bus as if attached to it.
+    """
+
+    def __init__(self, address=0x70):
+        self.address = address
+        self.bus = None
+        #: Channel mask, as last written.
+        self.selected = 0
+        self.channels = [{} for _ in range(8)]  # address -> device
+
+    @property
+    def clock(self):
+        """The clock of the bus this is on."""
+        return self.bus.clock
+
+    def add(self, channel, device):
+        """Attach a simulated device to a channel. Returns the device."""
+        if device.address in self.channels[channel]:
+            raise ValueError(f"address {device.address:02x} already in use")
+        device.bus = self
+        self.channels[channel][device.address] = device
+        return device
+
+    @property
+    def devices(self):
+        """All devices behind the multiplexer."""
+        return [dev for channel in self.channels for dev in channel.values()]
+
+    def readdress(self, device):
+        """Note that **device** now answers at a new address."""
+        for channel in self.channels:
+            for addr, dev in list(channel.items()):
+                if dev is device:
+                    del channel[addr]
+                    channel[device.address] = device
+
+    def find(self, address):
+        """The device answering at **address** on a selected channel, or None."""
+        for i, channel in enumerate(self.channels):
+            if self.selected & (1 << i) and address in channel:
+                return channel[address]
+        return None
+
+    def visible(self):
+        """Addresses answering on selected channels."""
+        return [
+            addr
+            for i, channel in enumerate(self.channels)
+            if self.selected & (1 << i)
+            for addr in channel
+        ]
+
+    def read(self, buf, start, end):
+        """Bus read: the channel mask."""
+        for i in range(start, end):
+            buf[i] = self.selected
+
+    def write(self, buf, start, end):
+        """Bus write: a new channel mask."""
+        if end > start:
+            self.selected = buf[end - 1]
+
+
+class SimInterruptPin:
+    """The shared, open-drain, active-low INT line of a :class:`SimI2C`.
+
+    Has a **value** like a pulled-up ``digitalio.DigitalInOut``.
+    """
+
+    def __init__(self, bus):
+        self.bus = bus
+
+    @property
+    def value(self):
+        """False while any button asserts its interrupt."""
+        devices = list(self.bus.devices)
+        for device in self.bus.devices:
+            devices.extend(getattr(device, "devices", ()))
+        return not any(getattr(device, "interrupt", False) for device in devices)
+
+
+class SimI2C:
+    """Simulated I2C bus with the interface of ``busio.I2C``.
+
+    :param clock: a :class:`SimClock` (the default) or :class:`RealClock`
+    :param latency: seconds charged to the clock for every transaction
+    :param byte_time: seconds charged to the clock per byte transferred,
+        including the address byte
+
+    Counts every transaction and byte transferred. A transaction is a write,
+    a read, or a write-then-read; probing an address counts as one too.
+    """
+
+    def __init__(self, clock=None, latency=0.0, byte_time=0.0):
+        self.clock = SimClock() if clock is None else clock
+        self.latency = latency
+        self.byte_time = byte_time
+        self.devices = []
+        self._by_addr = {}
+        self._locked = False
+        self.transactions = 0
+        self.bytes_written = 0
+        self.bytes_read = 0
+        self.locks = 0
+        self.busy_time = 0.0
+
+    def add(self, device):
+        """Attach a simulated device. Returns the device."""
+        if device.address in self._by_addr:
+            raise ValueError(f"address {device.address:02x} already in use")
+        device.bus = self
+        self.devices.append(device)
+        self._by_addr[device.address] = device
+        return device
+
+    def readdress(self, device):
+        """Note that **device** now answers at a new address."""
+        by_addr = {
+            addr: dev for addr, dev in self._by_addr.items() if dev is not device
+        }
+        by_addr[device.address] = device
+        self._by_addr = by_addr
+
+    def reset_counters(self):
+        """Zero the transaction, byte, lock and time counters."""
+        self.transactions = self.bytes_written = self.bytes_read = self.locks = 0
+        self.busy_time = 0.0
+
+    def _device(self, address, n_bytes):
+        """Charge for a transaction of **n_bytes** (address bytes included),
+        return the device addressed."""
+        if not self._locked:
+            raise RuntimeError("Function requires lock")
+        self.transactions += 1
+        cost = self.latency + self.byte_time * n_bytes
+        self.busy_time += cost
+        self.clock.advance(cost)
+        device = self._by_addr.get(address)
+        if device is None:
+            for mux in self.devices:
+                device = getattr(mux, "find", lambda _: None)(address)
+                if device is not None:
+                    break
+            else:
+                raise OSError(_ENODEV, "No such device")
+        faults = getattr(device, "faults", 0)
+        if faults:
+            if faults > 0:
+                device.faults = faults - 1
+            raise OSError(_ENODEV, "No such device")
+        return device
+
+    def try_lock(self):
+        """Lock the bus, unless it is already locked."""
+        if self._locked:
+            return False
+        self._locked = True
+        self.locks += 1
+        return True
+
+    def unlock(self):
+        """Release the bus lock."""
+        self._locked = False
+
+    def scan(self):
+        """Addresses that respond. (Costs one transaction per device.)"""
+        if not self._locked:
+            raise RuntimeError("Function requires lock")
+        found = list(self._by_addr)
+        for mux in self.devices:
+            found.extend(getattr(mux, "visible", list)())
+        self.transactions += len(found)
+        return sorted(found)
+
+    def writeto(self, address, buffer, *, start=0, end=None):
+        """Write **buffer[start:end]** to the device at **address**."""
+        if end is None:
+            end = len(buffer)
+        self._device(address, 1 + end - start).write(buffer, start, end)
+        self.bytes_written += end - start
+
+    def readfrom_into(self, address, buffer, *, start=0, end=None):
+        """Read into **buffer[start:end]** from the device at **address**."""
+        if end is None:
+            end = len(buffer)
+        self._device(address, 1 + end - start).read(buffer, start, end)
+        self.bytes_read += end - start
+
+    def writeto_then_readfrom(
+        self,
+        address,
+        out_buffer,
+        in_buffer,
+        *,
+        out_start=0,
+        out_end=None,
+        in_start=0,
+        in_end=None,
+    ):
+        """Write, then read with a repeated start, in one transaction."""
+        # pylint: disable=too-many-arguments
+        if out_end is None:
+            out_end = len(out_buffer)
+        if in_end is None:
+            in_end = len(in_buffer)
+        device = self._device(address, 2 + out_end - out_start + in_end - in_start)
+        device.write(out_buffer, out_start, out_end)
+        device.read(in_buffer, in_start, in_end)
+        self.bytes_written += out_end - out_start
+        self.bytes_read += in_end - in_start
+
+    def deinit(self):
+        """Nothing to release."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.deinit()
@@ -0,0 +1,339 @@
+# SPDX-FileCopyrightText: Copyright (c) 2021 Greg Paris
+#
+# SPDX-License-Identifier: MIT
+"""
+`i2c_button.trace`
+================================================================================
+
+Record I2C traffic to a file, and play it back without hardware.
+
+A :class:`RecordingI2C` wraps the bus handed to :class:`~i2c_button.I2C_Button`
+and writes every transaction, with its timing and the bytes that went each way,
+to a compact binary trace. Later, on any machine, a :class:`ReplayI2C` built
+from the trace answers the same requests with the same bytes, in order, so the
+very code that ran in the field runs again, deterministically:
+
+.. code-block:: python
+
+    # on the board (or under Blinka)
+    with open("/buttons.trace", "wb") as file:
+        i2c = RecordingI2C(busio.I2C(board.SCL, board.SDA), file)
+        run(i2c)
+
+    # at a desk
+    with open("buttons.trace", "rb") as file:
+        i2c = ReplayI2C(file, SimClock())
+    run(i2c)
+    print(i2c.transactions, i2c.clock.monotonic())
+
+Use :func:`read_trace` to analyze a trace directly.
+
+Each record is a 10-byte header (kind, address, microseconds since the previous
+record, bytes written, bytes read) followed by the bytes written and read. A
+failed transaction is recorded with :data:`TRACE_ERROR` set in its kind and
+the ``errno`` as the one byte read.
+"""
+
+# imports
+from collections import namedtuple
+import struct
+from i2c_button.monitor import _now_ns
+
+#: Record kind: ``writeto``.
+TRACE_WRITE = 1
+#: Record kind: ``readfrom_into``.
+TRACE_READ = 2
+#: Record kind: ``writeto_then_readfrom``.
+TRACE_WRITE_READ = 3
+#: Record kind: ``scan``; the addresses found are the bytes read.
+TRACE_SCAN = 4
+#: Flag in a record kind: the transaction raised ``OSError``.
+TRACE_ERROR = 0x80
+
+#: A transaction read back from a trace: **kind**, **address**, **time_us**
+#: since recording started, bytes written (**out**), bytes read (**data**) and
+#: the **errno** if it failed, else None.
+TraceRecord = namedtuple(
+    "TraceRecord", ("kind", "address", "time_us", "out", "data", "errno")
+)
+
+_MAGIC = b"I2CT\x01"
+_HEADER = "<BBLHH"
+_HEADER_LEN = struct.calcsize(_HEADER)
+_MAX_DELTA = 0xFFFFFFFF
+
+
+def read_trace(file):
+    """Generate the :class:`TraceRecord` of a trace, from a binary file object.
+
+    :raises ValueError: if the file is not a trace
+    """
+    if file.read(len(_MAGIC)) != _MAGIC:
+        raise ValueError("not an I2C trace")
+    time_us = 0
+    while True:
+        header = file.read(_HEADER_LEN)
+        if len(header) < _HEADER_LEN:
+            return
+        kind, address, delta, n_out, n_in = struct.unpack(_HEADER, header)
+        time_us += delta
+        out = file.read(n_out)
+        data = file.read(n_in)
+        if kind & TRACE_ERROR:
+            yield TraceRecord(kind & ~TRACE_ERROR, address, time_us, out, b"", data[0])
+        else:
+            yield TraceRecord(kind, address, time_us, out, data, None)
+
+
+class RecordingI2C:
+    """A ``busio.I2C`` that records its traffic to a trace.
+
+    :param i2c: the I2C object to pass requests on to
+    :param file: binary file object to write the trace to
+
+    The trace is written as transactions happen; close the file when done.
+    """
+
+    def __init__(self, i2c, file):
+        self.i2c = i2c
+        self.file = file
+        #: Transactions recorded.
+        self.transactions = 0
+        self._last_ns = _now_ns()
+        file.write(_MAGIC)
+
+    def _record(self, kind, address, out, data):
+        now = _now_ns()
+        delta = min((now - self._last_ns) // 1000, _MAX_DELTA)
+        self._last_ns = now
+        header = struct.pack(_HEADER, kind, address, delta, len(out), len(data))
+        self.file.write(header + bytes(out) + bytes(data))
+        self.transactions += 1
+
+    def _call(self, kind, address, out, func, *args, **kwargs):
+        """Perform **func** and record it, and any ``OSError`` it raises."""
+        # pylint: disable=too-many-arguments
+        try:
+            func(*args, **kwargs)
+        except OSError as exc:
+            errno = exc.args[0] if exc.args and isinstance(exc.args[0], int) else 0
+            self._record(kind | TRACE_ERROR, address, out, bytes((errno & 0xFF,)))
+            raise
+
+    def try_lock(self):
+        """As ``busio.I2C.try_lock``."""
+        return self.i2c.try_lock()
+
+    def unlock(self):
+        """As ``busio.I2C.unlock``."""
+        self.i2c.unlock()
+
+    def scan(self):
+        """As ``busio.I2C.scan``, recorded."""
+        found = self.i2c.scan()
+        self._record(TRACE_SCAN, 0, b"", bytes(found))
+        return found
+
+    def writeto(self, address, buffer, *, start=0, end=None):
+        """As ``busio.I2C.writeto``, recorded."""
+        if end is None:
+            end = len(buffer)
+        out = buffer[start:end]
+        self._call(
+            TRACE_WRITE,
+            address,
+            out,
+            self.i2c.writeto,
+            address,
+            buffer,
+            start=start,
+            end=end,
+        )
+        self._record(TRACE_WRITE, address, out, b"")
+
+    def readfrom_into(self, address, buffer, *, start=0, end=None):
+        """As ``busio.I2C.readfrom_into``, recorded."""
+        if end is None:
+            end = len(buffer)
+        self._call(
+            TRACE_READ,
+            address,
+            b"",
+            self.i2c.readfrom_into,
+            address,
+            buffer,
+            start=start,
+            end=end,
+        )
+        self._record(TRACE_READ, address, b"", buffer[start:end])
+
+    def writeto_then_readfrom(
+        self,
+        address,
+        out_buffer,
+        in_buffer,
+        *,
+        out_start=0,
+        out_end=None,
+        in_start=0,
+        in_end=None,
+    ):
+        """As ``busio.I2C.writeto_then_readfrom``, recorded."""
+        # pylint: disable=too-many-arguments
+        if out_end is None:
+            out_end = len(out_buffer)
+        if in_end is None:
+            in_end = len(in_buffer)
+        out = out_buffer[out_start:out_end]
+        self._call(
+            TRACE_WRITE_READ,
+            address,
+            out,
+            self.i2c.writeto_then_readfrom,
+            address,
+            out_buffer,
+            in_buffer,
+            out_start=out_start,
+            out_end=out_end,
+            in_start=in_start,
+            in_end=in_end,
+        )
+        self._record(TRACE_WRITE_READ, address, out, in_buffer[in_start:in_end])
+
+    def deinit(self):
+        """As ``busio.I2C.deinit``."""
+        self.i2c.deinit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.deinit()
+
+
+def _fill(buffer, start, end, data):
+    """Copy as much of **data** as fits into **buffer[start:end]**."""
+    n_bytes = min(len(data), end - start)
+    buffer[start : start + n_bytes] = data[:n_bytes]
+
+
+class ReplayI2C:
+    """A ``busio.I2C`` that answers from a trace.
+
+    :param file: binary file object holding a trace from :class:`RecordingI2C`;
+        it is read in full right away
+    :param clock: if given, an object like :class:`~i2c_button.simulator.SimClock`
+        whose ``now`` is moved to the recorded time of each transaction as it is
+        replayed
+    :param strict: check that each request matches the recording
+
+    Transactions are answered in the order recorded. With **strict**, a request
+    whose kind, address, bytes written or number of bytes to read differ from
+    the recording raises ``ValueError``, as replaying past that point would be
+    fiction. Otherwise a read gets no more of the recorded bytes than it asked for.
+    """
+
+    def __init__(self, file, clock=None, strict=True):
+        self.records = list(read_trace(file))
+        self.clock = clock
+        self.strict = strict
+        #: Transactions replayed so far.
+        self.transactions = 0
+        self._locked = False
+        self._start = None if clock is None else clock.monotonic()
+
+    @property
+    def remaining(self):
+        """Transactions left in the trace. (read-only)"""
+        return len(self.records) - self.transactions
+
+    def _next(self, kind, address, out, n_read=None):
+        """Return the next record, after checking it against the request.
+        **n_read**, if given, is the number of bytes the request reads."""
+        if not self._locked:
+            raise RuntimeError("Function requires lock")
+        if self.transactions == len(self.records):
+            raise ValueError("replay ran past the end of the trace")
+        record = self.records[self.transactions]
+        if self.strict and (
+            record.kind != kind or record.address != address or record.out != out
+        ):
+            raise ValueError(
+                f"transaction {self.transactions} differs from the trace: "
+                f"recorded {record.kind} to {record.address:02x} of {record.out.hex()}, "
+                f"replayed {kind} to {address:02x} of {bytes(out).hex()}"
+            )
+        if (
+            self.strict
+            and n_read is not None
+            and record.errno is None
+            and len(record.data) != n_read
+        ):
+            raise ValueError(
+                f"transaction {self.transactions} differs from the trace: "
+                f"recorded {len(record.data)} bytes read, replayed {n_read}"
+            )
+        self.transactions += 1
+        if self.clock is not None:
+            self.clock.now = self._start + record.time_us / 1000000
+        if record.errno is not None:
+            raise OSError(record.errno, "recorded failure")
+        return record
+
+    def try_lock(self):
+        """Lock the bus, unless it is already locked."""
+        if self._locked:
+            return False
+        self._locked = True
+        return True
+
+    def unlock(self):
+        """Release the bus lock."""
+        self._locked = False
+
+    def scan(self):
+        """The addresses the recorded scan found."""
+        return list(self._next(TRACE_SCAN, 0, b"").data)
+
+    def writeto(self, address, buffer, *, start=0, end=None):
+        """Replay a write."""
+        if end is None:
+            end = len(buffer)
+        self._next(TRACE_WRITE, address, bytes(buffer[start:end]))
+
+    def readfrom_into(self, address, buffer, *, start=0, end=None):
+        """Replay a read into **buffer[start:end]**."""
+        if end is None:
+            end = len(buffer)
+        data = self._next(TRACE_READ, address, b"", end - start).data
+        _fill(buffer, start, end, data)
+
+    def writeto_then_readfrom(
+        self,
+        address,
+        out_buffer,
+        in_buffer,
+        *,
+        out_start=0,
+        out_end=None,
+        in_start=0,
+        in_end=None,
+    ):
+        """Replay a write, then read."""
+        # pylint: disable=too-many-arguments
+        if out_end is None:
+            out_end = len(out_buffer)
+        if in_end is None:
+            in_end = len(in_buffer)
+        out = bytes(out_buffer[out_start:out_end])
+        data = self._next(TRACE_WRITE_READ, address, out, in_end - in_start).data
+        _fill(in_buffer, in_start, in_end, data)
+
+    def deinit(self):
+        """Nothing to release."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.deinit()
@@ -0,0 +1,46 @@
+# SPDX-FileCopyrightText: Copyright (c) 2021 Greg Paris
+#
+# SPDX-License-Identifier: MIT
+"""Fixtures shared by the tests: simulated buttons on a simulated bus."""
+
+import pytest
+from i2c_button import I2C_Button
+from i2c_button.simulator import SimButton, SimI2C
+
+FIRST_ADDR = 0x10
+DEBOUNCE = 0.05  # seconds; well past the firmware's 10 ms debounce time
+
+
+def _make_rig(n_buttons=3, clock=None, **kwargs):
+    """A bus with **n_buttons** simulated buttons from 0x10 up, and an
+    I2C_Button named by address for each. Returns (bus, sims, buttons).
+
+    :param clock: passed on to SimI2C
+    :param kwargs: passed on to I2C_Button, e.g. **cache**
+    """
+    i2c = SimI2C(clock)
+    addrs = range(FIRST_ADDR, FIRST_ADDR + n_buttons)
+    sims = [i2c.add(SimButton(addr)) for addr in addrs]
+    buttons = [I2C_Button(i2c, addr, name=hex(addr), **kwargs) for addr in addrs]
+    return i2c, sims, buttons
+
+
+def _press(sim):
+    """Press a simulated button and hold it past the debounce time."""
+    sim.press()
+    sim.bus.clock.advance(DEBOUNCE)
+
+
+@pytest.fixture(name="make_rig")
+def fixture_make_rig():
+    return _make_rig
+
+
+@pytest.fixture(name="rig")
+def fixture_rig():
+    return _make_rig()
+
+
+@pytest.fixture(name="press")
+def fixture_press():
+    return _press
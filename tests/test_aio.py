@@ -0,0 +1,75 @@
+# SPDX-FileCopyrightText: Copyright (c) 2021 Greg Paris
+#
+# SPDX-License-Identifier: MIT
+"""button_events() on the simulated bus."""
+
+import asyncio
+from i2c_button import ClickEvent, PressEvent
+from i2c_button.aio import button_events
+
+
+async def _next(events):
+    async for event in events:
+        return event
+
+
+def test_press_then_click(make_rig, press):
+    _, sims, buttons = make_rig(2)
+
+    async def main():
+        events = button_events(buttons, interval=0.001)
+        press(sims[1])
+        first = await _next(events)
+        sims[1].release()
+        second = await _next(events)
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert isinstance(first, PressEvent)
+    assert first.button is buttons[1]
+    assert isinstance(second, ClickEvent)
+    assert second.button is buttons[1]
+    assert not any(buttons[1].status)  # cleared by the sweep
+
+
+def test_tasks_run_between_sweeps(make_rig, press):
+    i2c, sims, buttons = make_rig(2)
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(i2c.transactions)
+            await asyncio.sleep(0)
+
+    async def main():
+        task = asyncio.create_task(ticker())
+        events = button_events(buttons, interval=0.001)
+        await asyncio.sleep(0.01)
+        press(sims[0])
+        event = await _next(events)
+        task.cancel()
+        return event
+
+    event = asyncio.run(main())
+    assert event.button is buttons[0]
+    assert len(ticks) > 1
+
+
+def test_adaptive_interval(make_rig, press):
+    _, sims, buttons = make_rig(2)
+
+    async def main():
+        events = button_events(buttons, interval=0.05, adaptive=True)
+        scheduler = events.scheduler
+        task = asyncio.create_task(_next(events))
+        await asyncio.sleep(0.04)  # a few idle sweeps
+        idle = scheduler.interval
+        press(sims[0])
+        event = await task
+        return scheduler, idle, event
+
+    scheduler, idle, event = asyncio.run(main())
+    assert scheduler.min_interval == 0.01  # the firmware's debounce time
+    assert idle > scheduler.min_interval
+    assert isinstance(event, PressEvent)
+    assert scheduler.interval == scheduler.min_interval
@@ -0,0 +1,65 @@
+# SPDX-FileCopyrightText: Copyright (c) 2021 Greg Paris
+#
+# SPDX-License-Identifier: MIT
+"""BackgroundPoller's thread, on the simulated bus with a real clock."""
+
+import threading
+import time
+import pytest
+from i2c_button.background import BackgroundPoller
+from i2c_button.ring import DROP_NEWEST, DROP_OLDEST
+from i2c_button.simulator import RealClock
+
+DEADLINE = 2.0  # seconds; far longer than the poller should ever need
+
+
+@pytest.fixture(name="rig")
+def fixture_rig(make_rig):
+    _, sims, buttons = make_rig(clock=RealClock())
+    return sims, buttons
+
+
+def _click(sims):
+    for sim in sims:
+        sim.press()
+    time.sleep(0.03)  # past the debounce time
+    for sim in sims:
+        sim.release()
+
+
+def _wait_for(poller, n_events):
+    deadline = time.monotonic() + DEADLINE
+    while poller.stats().events < n_events:
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def test_start_stop(rig):
+    sims, buttons = rig
+    poller = BackgroundPoller(buttons, interval=0.005)
+    with poller:
+        assert poller.running
+        assert poller.get(0) is None
+        timer = threading.Timer(0.05, _click, (sims[:1],))
+        timer.start()
+        event = poller.get()  # waits for the click
+        timer.join()
+    assert not poller.running
+    assert event.button is buttons[0]
+    sweeps = poller.stats().sweeps
+    time.sleep(0.03)
+    assert poller.stats().sweeps == sweeps
+
+
+@pytest.mark.parametrize(
+    "policy, kept", ((DROP_OLDEST, ["0x11", "0x12"]), (DROP_NEWEST, ["0x10", "0x11"]))
+)
+def test_full_queue(rig, policy, kept):
+    sims, buttons = rig
+    _click(sims)
+    with BackgroundPoller(buttons, interval=0.005, maxsize=2, policy=policy) as poller:
+        _wait_for(poller, len(sims))
+    assert [event.button.name for event in poller.events()] == kept
+    stats = poller.stats()
+    assert (stats.events, stats.dropped, stats.depth, stats.max_depth) == (3, 1, 0, 2)
+    assert poller.get(0.01) is None
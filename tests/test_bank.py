@@ -0,0 +1,142 @@
+# SPDX-FileCopyrightText: Copyright (c) 2021 Greg Paris
+#
+# SPDX-License-Identifier: MIT
+"""ButtonBank on the simulated bus."""
+
+import pytest
+from i2c_button import ButtonBank, ButtonError, I2C_Button
+from i2c_button.simulator import SimButton, SimI2C
+
+OFF = (0, 0, 0, 0)
+
+
+@pytest.fixture(name="bank_rig")
+def fixture_bank_rig(make_rig):
+    def bank_rig(cache):
+        i2c, sims, buttons = make_rig(2, cache=cache)
+        return i2c, sims, ButtonBank(buttons)
+
+    return bank_rig
+
+
+@pytest.mark.parametrize("cache", (False, True))
+def test_set_leds_after_write(cache, bank_rig):
+    _, sims, bank = bank_rig(cache)
+    button = bank.buttons[0]
+    bank.set_leds({button: OFF})
+    button.led_bright = 255
+    bank.set_leds({button: OFF})
+    assert sims[0].regs[0x19] == 0
+
+
+@pytest.mark.parametrize("cache", (False, True))
+def test_set_leds_after_set_led(cache, bank_rig):
+    _, sims, bank = bank_rig(cache)
+    button = bank.buttons[1]
+    bank.set_leds({button: OFF})
+    button.set_led(100)
+    bank.set_leds({button: OFF})
+    assert sims[1].regs[0x19] == 0
+
+
+@pytest.mark.parametrize("cache", (False, True))
+def test_set_leds_after_configure(cache, bank_rig):
+    _, sims, bank = bank_rig(cache)
+    bank.set_leds({button: OFF for button in bank})
+    bank.configure(led_bright=200)
+    bank.set_leds({button: OFF for button in bank})
+    assert [sim.regs[0x19] for sim in sims] == [0, 0]
+
+
+def test_set_leds_skips_cached(bank_rig):
+    i2c, sims, bank = bank_rig(True)
+    states = {bank.buttons[0]: (10, 1, 1000, 200), bank.buttons[1]: OFF}
+    bank.set_leds(states)
+    assert sims[0].regs[0x19:0x1F] == bytes((10, 1, 0xE8, 0x03, 200, 0))
+    i2c.reset_counters()
+    bank.set_leds(states)
+    assert i2c.transactions == 0
+    assert i2c.locks == 0
+
+
+def test_set_leds_uncached(bank_rig):
+    i2c, _, bank = bank_rig(False)
+    states = {button: OFF for button in bank}
+    bank.set_leds(states)
+    i2c.reset_counters()
+    bank.set_leds(states)
+    assert i2c.transactions == 2
+    assert i2c.locks == 1
+
+
+class _StuckLED(SimButton):  # pylint: disable=too-few-public-methods
+    """A button whose LED_BRIGHTNESS register ignores writes."""
+
+    def _store(self, register, value):
+        if register != 0x19:
+            super()._store(register, value)
+
+
+def test_verify_refills_cache():
+    i2c = SimI2C()
+    sim = i2c.add(_StuckLED(0x10))
+    button = I2C_Button(i2c, 0x10, cache=True)
+    with pytest.raises(ButtonError):
+        button.configure(verify=True, led_bright=200, led_gran=3)
+    assert sim.regs[0x19:0x1B] == bytes((0, 3))
+    i2c.reset_counters()
+    assert (button.led_bright, button.led_gran) == (0, 3)
+    button.led_bright = 0  # the cache knows it already holds that
+    assert i2c.transactions == 0
+
+
+def test_bank_verify_refills_cache():
+    i2c = SimI2C()
+    sims = [i2c.add(SimButton(0x10)), i2c.add(_StuckLED(0x11))]
+    bank = ButtonBank([I2C_Button(i2c, sim.address, cache=True) for sim in sims])
+    with pytest.raises(ButtonError):
+        bank.configure(verify=True, led_bright=200)
+    assert [button.led_bright for button in bank] == [200, 0]
+    bank.set_leds({button: (200, 1, 0, 0) for button in bank})
+    assert [sim.regs[0x19] for sim in sims] == [200, 0]
+
+
+def test_changes_edges(bank_rig, press):
+    _, sims, bank = bank_rig(False)
+    assert bank.changes() == []
+    press(sims[0])
+    found = bank.changes()
+    assert [(type(event).__name__, event.button) for event in found] == [
+        ("PressEvent", bank.buttons[0])
+    ]
+    assert bank.changes() == []  # still down: no edge
+    sims[0].release()
+    found = bank.changes()
+    assert [type(event).__name__ for event in found] == ["ReleaseEvent", "ClickEvent"]
+    assert bank.changes() == []
+
+
+def test_changes_quiet_sweep(bank_rig):
+    i2c, _, bank = bank_rig(False)
+    bank.changes()
+    i2c.reset_counters()
+    assert bank.changes() == []
+    assert i2c.transactions == 2
+    assert i2c.locks == 1
+
+
+def test_changes_after_poll(bank_rig, press):
+    _, sims, bank = bank_rig(False)
+    bank.changes()
+    press(sims[1])
+    assert bank.poll() == [bank.buttons[1]]
+    assert bank.flags[1] == 5  # pressed, event
+    found = bank.changes()
+    assert [(type(event).__name__, event.button) for event in found] == [
+        ("PressEvent", bank.buttons[1])
+    ]
+    assert bank.flags[1] == 5  # as poll() read it
+    sims[1].release()
+    bank.poll()
+    found = bank.changes()
+    assert [type(event).__name__ for event in found] == ["ReleaseEvent", "ClickEvent"]
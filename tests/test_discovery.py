@@ -0,0 +1,110 @@
+# SPDX-FileCopyrightText: Copyright (c) 2021 Greg Paris
+#
+# SPDX-License-Identifier: MIT
+"""discover() on the simulated bus, and its address file."""
+
+import pytest
+from i2c_button import LeanButton
+from i2c_button.discovery import BuildError, build_buttons, discover
+from i2c_button.simulator import SimButton, SimI2C
+
+
+def test_finds_buttons_only():
+    i2c = SimI2C()
+    for addr in (0x30, 0x10, 0x20):
+        i2c.add(SimButton(addr))
+    i2c.add(SimButton(0x40, dev_id=0x99))  # not a button
+    i2c.add(SimButton(0x50, version=(1, 0)))
+    buttons = discover(i2c, versions=("1.1",))
+    assert i2c.locks == 1
+    assert [button.name for button in buttons] == ["0x10", "0x20", "0x30"]
+    assert [button.i2c_addr for button in buttons] == [0x10, 0x20, 0x30]
+
+
+def test_by_address():
+    i2c = SimI2C()
+    i2c.add(SimButton(0x10))
+    buttons = discover(i2c, by_address=True)
+    assert list(buttons) == [0x10]
+    assert buttons[0x10].i2c_addr == 0x10
+
+
+def test_warm_start_from_file(tmp_path):
+    path = str(tmp_path / "addrs")
+    i2c = SimI2C()
+    i2c.add(SimButton(0x10))
+    i2c.add(SimButton(0x11))
+    assert len(discover(i2c, path=path)) == 2
+    i2c.reset_counters()
+    buttons = discover(i2c, path=path)
+    assert i2c.transactions == 0
+    assert [button.i2c_addr for button in buttons] == [0x10, 0x11]
+
+
+def test_nothing_found_not_saved(tmp_path):
+    path = tmp_path / "addrs"
+    i2c = SimI2C()
+    assert not discover(i2c, path=str(path))
+    assert not path.exists()
+    i2c.add(SimButton(0x10))
+    assert len(discover(i2c, path=str(path))) == 1
+
+
+def test_empty_file_is_not_cached(tmp_path):
+    path = tmp_path / "addrs"
+    path.write_bytes(b"")
+    i2c = SimI2C()
+    i2c.add(SimButton(0x10))
+    assert len(discover(i2c, path=str(path))) == 1
+    assert path.read_bytes() == b"\x10"
+
+
+def test_build_checks_in_one_lock():
+    i2c = SimI2C()
+    for addr in (0x10, 0x11, 0x12):
+        i2c.add(SimButton(addr))
+    buttons = build_buttons(i2c, {0x12: "c", 0x10: "a"})
+    assert i2c.locks == 1
+    assert i2c.transactions == 2
+    assert [button.name for button in buttons] == ["c", "a"]
+
+
+def test_build_reports_problems():
+    i2c = SimI2C()
+    i2c.add(SimButton(0x10))
+    i2c.add(SimButton(0x11, dev_id=0x99))
+    with pytest.raises(BuildError) as info:
+        build_buttons(i2c, (0x10, 0x11, 0x12), button_class=LeanButton)
+    assert info.value.problems == {
+        0x11: "device ID 99, not 5d",
+        0x12: "no response",
+    }
+    assert [button.name for button in info.value.buttons] == ["0x10"]
+    assert isinstance(info.value.buttons[0], LeanButton)
+
+
+def test_build_unchecked():
+    i2c = SimI2C()
+    buttons = build_buttons(i2c, (0x10, 0x11), check=False)
+    assert len(buttons) == 2
+    assert i2c.transactions == 0
+    with pytest.raises(OSError):
+        buttons[0].status  # pylint: disable=pointless-statement
+
+
+def test_excluded_not_touched():
+    i2c = SimI2C()
+    for addr in (0x10, 0x11, 0x12):
+        i2c.add(SimButton(addr))
+    discover(i2c)
+    scanned = i2c.transactions
+    i2c.reset_counters()
+    buttons = discover(i2c, exclude=(0x11,))
+    assert i2c.transactions == scanned - 1  # 0x11 was not identified
+    assert [button.i2c_addr for button in buttons] == [0x10, 0x12]
+    i2c.reset_counters()
+    buttons = build_buttons(
+        i2c, {0x10: "a", 0x11: "b", 0x13: "d"}, exclude=(0x11, 0x13)
+    )
+    assert [button.name for button in buttons] == ["a"]
+    assert i2c.transactions == 1
@@ -0,0 +1,118 @@
+# SPDX-FileCopyrightText: Copyright (c) 2021 Greg Paris
+#
+# SPDX-License-Identifier: MIT
+"""Memory footprint on CPython: heap bytes per button, and per module imported.
+
+The numbers are CPython's, not CircuitPython's, but they move together: a new
+attribute or namedtuple, or a feature added to the core module rather than to
+a submodule of its own, shows up here first.
+"""
+
+import os
+import subprocess
+import sys
+import tracemalloc
+import pytest
+from i2c_button import I2C_Button, LeanButton
+from i2c_button.simulator import SimButton, SimI2C
+
+N_BUTTONS = 50
+FIRST_ADDR = 0x08
+
+# heap bytes per instance, made without probing; about 300 either way when the
+# interpreter's free lists are empty, less after other tests have run
+INSTANCE_BUDGETS = {LeanButton: 384, I2C_Button: 400}
+
+# heap bytes kept by importing a module: its code and what it builds, over and
+# above the standard library, Bus Device and (for a submodule) the core module.
+# Compiling from source rather than loading cached bytecode keeps more, so each
+# budget is about 1.25 times the from-source figure.
+MODULE_BUDGETS = {
+    "i2c_button": 216 * 1024,
+    "i2c_button.aio": 24 * 1024,
+    "i2c_button.background": 64 * 1024,
+    "i2c_button.discovery": 28 * 1024,
+    "i2c_button.gestures": 64 * 1024,
+    "i2c_button.health": 44 * 1024,
+    "i2c_button.interrupts": 16 * 1024,
+    "i2c_button.monitor": 40 * 1024,
+    "i2c_button.mux": 32 * 1024,
+    "i2c_button.ordering": 8 * 1024,
+    "i2c_button.provision": 60 * 1024,
+    "i2c_button.ring": 28 * 1024,
+    "i2c_button.scheduler": 16 * 1024,
+    "i2c_button.simulator": 92 * 1024,
+    "i2c_button.trace": 92 * 1024,
+}
+
+# imported before tracing starts, so that a module is charged only for itself
+PRELOAD = (
+    "array",
+    "asyncio",
+    "collections",
+    "queue",
+    "struct",
+    "threading",
+    "time",
+    "adafruit_bus_device.i2c_device",
+)
+
+PROBE = """
+import sys, tracemalloc, {preload}
+tracemalloc.start()
+import {name}
+print(tracemalloc.get_traced_memory()[0])
+print(" ".join(sorted(module for module in sys.modules if "i2c_button" in module)))
+"""
+
+
+def _import_probe(name):
+    """Bytes kept by importing **name**, and the library modules then loaded."""
+    preload = PRELOAD if name == "i2c_button" else PRELOAD + ("i2c_button",)
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE.format(preload=", ".join(preload), name=name)],
+        capture_output=True,
+        check=True,
+        env=env,
+        text=True,
+    ).stdout.split("\n")
+    return int(output[0]), output[1].split()
+
+
+@pytest.mark.parametrize("cls", INSTANCE_BUDGETS)
+def test_instance_bytes(cls):
+    i2c = SimI2C()
+    addrs = range(FIRST_ADDR, FIRST_ADDR + N_BUTTONS)
+    for addr in addrs:
+        i2c.add(SimButton(addr))
+    cls(i2c, FIRST_ADDR, probe=False)  # first-use costs are not per instance
+    tracemalloc.start()
+    try:
+        buttons = [cls(i2c, addr, probe=False) for addr in addrs]
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    assert len(buttons) == N_BUTTONS
+    assert size / N_BUTTONS <= INSTANCE_BUDGETS[cls]
+
+
+def test_no_instance_dict():
+    i2c = SimI2C()
+    i2c.add(SimButton(FIRST_ADDR))
+    for cls in INSTANCE_BUDGETS:
+        button = cls(i2c, FIRST_ADDR, probe=False)
+        assert not hasattr(button, "__dict__")
+        with pytest.raises(AttributeError):
+            button.color = "red"
+
+
+@pytest.mark.parametrize("name", MODULE_BUDGETS)
+def test_module_bytes(name):
+    size, _ = _import_probe(name)
+    assert size <= MODULE_BUDGETS[name]
+
+
+def test_core_imports_no_submodule():
+    _, loaded = _import_probe("i2c_button")
+    assert loaded == ["i2c_button"]
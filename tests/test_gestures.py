@@ -0,0 +1,102 @@
+# SPDX-FileCopyrightText: Copyright (c) 2021 Greg Paris
+#
+# SPDX-License-Identifier: MIT
+"""GestureRecognizer on the simulated bus, with a simulated clock."""
+
+import pytest
+from i2c_button import I2C_Button
+from i2c_button.gestures import CLICK, DOUBLE_CLICK, LONG_PRESS, REPEAT
+from i2c_button.gestures import GestureRecognizer
+from i2c_button.simulator import SimButton, SimClock, SimI2C
+
+PERIOD = 1 << 29  # of supervisor.ticks_ms
+
+# (time in ms, pressed): a click, a double-click, then a 1.5 second hold
+SCRIPT = [
+    (100, True),
+    (180, False),
+    (1000, True),
+    (1080, False),
+    (1200, True),
+    (1270, False),
+    (2000, True),
+    (3500, False),
+]
+
+# kind and when it was complete, in ms; presses count from the end of the
+# 10 ms debounce, so the long press is complete at 2010 + 800
+EXPECTED = [
+    (CLICK, 180),
+    (DOUBLE_CLICK, 1270),
+    (LONG_PRESS, 2810),
+    (REPEAT, 3060),
+    (REPEAT, 3310),
+]
+
+
+def _run(poll_ms, offset_ms=0, end_ms=4000):
+    """Play **SCRIPT**, polling every **poll_ms**. Return gestures as
+    (kind, when) and the bus. The clock reads **offset_ms** ahead, modulo 2**29."""
+    clock = SimClock()
+    i2c = SimI2C(clock)
+    sim = i2c.add(SimButton(0x6F))
+    button = I2C_Button(i2c, probe=False)
+    gestures = GestureRecognizer(
+        [button],
+        double_ms=300,
+        long_ms=800,
+        repeat_ms=250,
+        clock_ms=lambda: (round(clock.now * 1000) + offset_ms) % PERIOD,
+    )
+    script = list(SCRIPT)
+    found = []
+    for now in range(end_ms):
+        clock.now = now / 1000
+        while script and script[0][0] <= now:
+            if script.pop(0)[1]:
+                sim.press()
+            else:
+                sim.release()
+        if now % poll_ms == 0:
+            for gesture in gestures.poll():
+                assert gesture.button is button
+                found.append((gesture.kind, now - gesture.ms))
+    return found, i2c
+
+
+def _check(found):
+    assert [kind for kind, _ in found] == [kind for kind, _ in EXPECTED]
+    for (_, when), (_, expected) in zip(found, EXPECTED):
+        assert when == pytest.approx(expected, abs=2)
+
+
+@pytest.mark.parametrize("poll_ms", (10, 50, 100, 250))
+def test_gestures(poll_ms):
+    found, _ = _run(poll_ms)
+    _check(found)
+
+
+@pytest.mark.parametrize("poll_ms", (10, 100))
+def test_gestures_across_wrap(poll_ms):
+    found, _ = _run(poll_ms, offset_ms=PERIOD - 1500)
+    _check(found)
+
+
+def test_quiet_poll():
+    _, i2c = _run(100, end_ms=4000)
+    i2c.reset_counters()
+    clock = i2c.clock
+    clock.advance(1.0)
+    gestures = GestureRecognizer(
+        [I2C_Button(i2c, probe=False)], clock_ms=lambda: round(clock.now * 1000)
+    )
+    for _ in range(10):
+        assert gestures.poll() == []
+    assert i2c.transactions == 10
+
+
+def test_poll_too_slow():
+    found, _ = _run(1000)
+    kinds = [kind for kind, _ in found]
+    assert DOUBLE_CLICK not in kinds  # only the latest press and click are kept
+    assert kinds.count(LONG_PRESS) == 1
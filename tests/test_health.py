@@ -0,0 +1,73 @@
+# SPDX-FileCopyrightText: Copyright (c) 2021 Greg Paris
+#
+# SPDX-License-Identifier: MIT
+"""GuardedBank with failing buttons on the simulated bus."""
+
+import pytest
+from i2c_button import ButtonError
+from i2c_button.health import CLOSED, HALF_OPEN, OPEN, GuardedBank
+
+
+@pytest.fixture(name="rig")
+def fixture_rig(make_rig):
+    i2c, sims, buttons = make_rig()
+    bank = GuardedBank(buttons, retries=2, threshold=3, cooldown=5.0, clock=i2c.clock)
+    return i2c, sims, bank
+
+
+def test_retry_hides_a_glitch(rig, press):
+    _, sims, bank = rig
+    sims[1].faults = 1
+    press(sims[2])
+    assert bank.poll() == [bank.buttons[2]]
+    assert bank.retried == 1
+    assert bank.health(bank.buttons[1]) == (CLOSED, 0, 1, None)
+
+
+def test_dead_button_isolated(rig, press):
+    i2c, sims, bank = rig
+    dead = bank.buttons[0]
+    sims[0].faults = -1
+    press(sims[1])
+    found = bank.events()
+    assert [event.button for event in found] == [bank.buttons[1]]
+    assert bank.health(dead).state == OPEN
+    assert bank.health(dead).errors == 3
+    assert bank.unhealthy() == [dead]
+    i2c.reset_counters()
+    bank.poll()
+    assert i2c.transactions == 2  # the open circuit is left alone
+    with pytest.raises(ButtonError):
+        bank.call(dead, dead.set_led, 255)
+    i2c.clock.advance(5.0)
+    bank.poll()  # one attempt, which fails
+    assert bank.health(dead).state == OPEN
+    assert bank.health(dead).errors == 4
+    sims[0].faults = 0
+    i2c.clock.advance(5.0)
+    assert bank.poll() == [bank.buttons[1]]  # still held down
+    assert bank.health(dead)[:3] == (CLOSED, 0, 4)
+    assert bank.unhealthy() == []
+
+
+def test_half_open(rig):
+    i2c, sims, bank = rig
+    sims[2].faults = -1
+    bank.poll()
+    sims[2].faults = 0
+    i2c.clock.advance(5.0)
+    assert bank._admit(2)  # pylint: disable=protected-access
+    assert bank.health(bank.buttons[2]).state == HALF_OPEN
+
+
+def test_reset(rig):
+    _, sims, bank = rig
+    for sim in sims:
+        sim.faults = -1
+    bank.poll()
+    assert len(bank.unhealthy()) == 3
+    bank.reset(bank.buttons[1])
+    assert bank.health(bank.buttons[1]) == (CLOSED, 0, 0, None)
+    assert len(bank.unhealthy()) == 2
+    bank.reset()
+    assert bank.unhealthy() == []
@@ -0,0 +1,79 @@
+# SPDX-FileCopyrightText: Copyright (c) 2021 Greg Paris
+#
+# SPDX-License-Identifier: MIT
+"""InterruptDispatcher with the simulated bus's INT line as its pin."""
+
+from i2c_button import ClickEvent, PressEvent
+from i2c_button.interrupts import InterruptDispatcher
+from i2c_button.simulator import SimInterruptPin
+
+
+def test_quiet_line_costs_nothing(rig):
+    i2c, _, buttons = rig
+    dispatcher = InterruptDispatcher(buttons, SimInterruptPin(i2c))
+    dispatcher.enable()
+    i2c.reset_counters()
+    for _ in range(100):
+        assert dispatcher.check() == []
+    assert not dispatcher.asserted
+    assert i2c.transactions == 0
+
+
+def test_press_and_click_dispatched(rig, press):
+    i2c, sims, buttons = rig
+    seen = []
+    dispatcher = InterruptDispatcher(buttons, SimInterruptPin(i2c), seen.append)
+    dispatcher.enable()
+    press(sims[1])
+    assert dispatcher.asserted
+    found = dispatcher.check()
+    assert [type(event) for event in found] == [PressEvent]
+    assert found[0].button is buttons[1]
+    assert seen == found
+    assert not dispatcher.asserted  # the sweep cleared the status
+    sims[1].release()
+    assert dispatcher.asserted
+    found = dispatcher.check()
+    assert [type(event) for event in found] == [ClickEvent]
+    assert seen[-1] is found[0]
+    assert not dispatcher.asserted
+
+
+def test_enable_clears_stale_events(rig, press):
+    i2c, sims, buttons = rig
+    press(sims[0])
+    sims[0].release()
+    dispatcher = InterruptDispatcher(buttons, SimInterruptPin(i2c))
+    dispatcher.enable()
+    assert not dispatcher.asserted
+    assert dispatcher.check() == []
+
+
+def test_click_only(rig, press):
+    i2c, sims, buttons = rig
+    dispatcher = InterruptDispatcher(buttons, SimInterruptPin(i2c))
+    dispatcher.enable(on_click=True, on_press=False)
+    assert buttons[2].interrupts == (True, False)
+    press(sims[2])
+    assert not dispatcher.asserted
+    sims[2].release()
+    assert dispatcher.asserted
+    found = dispatcher.check()
+    assert ClickEvent in [type(event) for event in found]
+    assert not dispatcher.asserted
+
+
+def test_active_high(rig, press):
+    _, sims, buttons = rig
+
+    class Inverted:  # pylint: disable=too-few-public-methods
+        value = True
+
+    pin = Inverted()
+    dispatcher = InterruptDispatcher(buttons, pin, active_low=False)
+    dispatcher.enable()
+    press(sims[0])
+    pin.value = False
+    assert dispatcher.check() == []
+    pin.value = True
+    assert [event.button for event in dispatcher.check()] == [buttons[0]]
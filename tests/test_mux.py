@@ -0,0 +1,89 @@
+# SPDX-FileCopyrightText: Copyright (c) 2021 Greg Paris
+#
+# SPDX-License-Identifier: MIT
+"""Buttons behind a simulated TCA9548A multiplexer."""
+
+import pytest
+from i2c_button import ButtonBank
+from i2c_button.discovery import discover
+from i2c_button.mux import TCA9548A, mux_buttons
+from i2c_button.simulator import SimButton, SimI2C, SimTCA9548A
+
+ADDRESSES = [(0, 0x6F), (0, 0x6E), (1, 0x6F), (2, 0x6F)]
+
+
+@pytest.fixture(name="rig")
+def fixture_rig():
+    i2c = SimI2C()
+    sim_mux = i2c.add(SimTCA9548A())
+    sims = {key: sim_mux.add(key[0], SimButton(key[1])) for key in ADDRESSES}
+    return i2c, sim_mux, sims, TCA9548A(i2c)
+
+
+def test_construction_selections(rig):
+    _, sim_mux, _, mux = rig
+    buttons = mux_buttons(mux, ADDRESSES)
+    assert mux.selections == 3
+    assert [button.name for button in buttons] == ["0:6f", "0:6e", "1:6f", "2:6f"]
+    assert sim_mux.selected == mux.selected == 1 << 2
+
+
+def test_sweep_selections(rig):
+    i2c, _, _, mux = rig
+    bank = ButtonBank(mux_buttons(mux, ADDRESSES))
+    for _ in range(5):
+        mux.selections = 0
+        i2c.reset_counters()
+        assert bank.poll() == []
+        assert mux.selections == 3
+        assert i2c.transactions == 3 + len(ADDRESSES)
+
+
+def test_same_address_channels(rig, press):
+    i2c, _, sims, mux = rig
+    bank = ButtonBank(mux_buttons(mux, ADDRESSES))
+    press(sims[(1, 0x6F)])
+    assert [button.name for button in bank.poll()] == ["1:6f"]
+    assert [event.button.name for event in bank.events()] == ["1:6f"]
+
+
+def test_channel_not_reselected(rig):
+    _, _, _, mux = rig
+    button = mux_buttons(mux, [(1, 0x6F)])[0]
+    mux.selections = 0
+    for _ in range(10):
+        assert not any(button.status)
+    assert mux.selections == 0
+    mux.invalidate()
+    assert button.i2c_addr == 0x6F
+    assert mux.selections == 1
+
+
+def test_discover_on_a_channel(rig):
+    _, _, _, mux = rig
+    buttons = discover(mux[0])
+    assert [button.name for button in buttons] == ["0x6e", "0x6f"]
+    assert [button.i2c is mux[0] for button in buttons] == [True, True]
+
+
+def test_failed_selection_unlocks(rig):
+    i2c, sim_mux, _, mux = rig
+    sim_mux.faults = 1
+    with pytest.raises(OSError):
+        mux[3].try_lock()
+    assert mux.selected is None
+    assert i2c.try_lock()
+    i2c.unlock()
+    button = mux_buttons(mux, [(2, 0x6F)])[0]
+    assert button.i2c_addr == 0x6F
+
+
+def test_discover_parent_bus(rig):
+    i2c, sim_mux, _, mux = rig
+    i2c.add(SimButton(0x30))
+    buttons = discover(i2c, exclude=(mux.address,))
+    assert [button.name for button in buttons] == ["0x30"]
+    behind = mux_buttons(mux, [(1, 0x6F)])[0]
+    discover(i2c, exclude=(mux.address,))
+    assert sim_mux.selected == mux.selected == 1 << 1
+    assert behind.i2c_addr == 0x6F
@@ -0,0 +1,82 @@
+# SPDX-FileCopyrightText: Copyright (c) 2021 Greg Paris
+#
+# SPDX-License-Identifier: MIT
+"""Provisioner on the simulated bus, with buttons connected as asked for."""
+
+from i2c_button.provision import ASSIGNED, FAILED, MISSING, OK, Provisioner
+from i2c_button.simulator import SimButton, SimI2C
+
+PLAN = [0x12, 0x10, 0x11]
+CONFIG = {"debounce_ms": 20, "led_bright": 0}
+
+
+def _connector(i2c, asked, limit=None):
+    """A connect() that plugs in a new button at the default address, until
+    **limit** have been; each address asked for is appended to **asked**."""
+
+    def connect(addr):
+        asked.append(addr)
+        if limit is not None and len(asked) > limit:
+            return False
+        i2c.add(SimButton())
+        return True
+
+    return connect
+
+
+def _outcomes(results):
+    return [(result.address, result.outcome) for result in results]
+
+
+def test_fresh_run():
+    i2c = SimI2C()
+    asked = []
+    results = Provisioner(i2c, PLAN, **CONFIG).run(_connector(i2c, asked))
+    assert asked == PLAN
+    assert _outcomes(results) == [(addr, ASSIGNED) for addr in PLAN]
+    sims = {sim.address: sim for sim in i2c.devices}
+    assert sorted(sims) == sorted(PLAN)
+    for sim in sims.values():
+        assert sim.regs[0x05:0x07] == bytes((20, 0))
+        assert sim.regs[0x19] == 0
+
+
+def test_rerun_checks_only():
+    i2c = SimI2C()
+    Provisioner(i2c, PLAN, **CONFIG).run(_connector(i2c, []))
+    i2c.reset_counters()
+    results = Provisioner(i2c, PLAN, **CONFIG).run()
+    assert _outcomes(results) == [(addr, OK) for addr in PLAN]
+    assert [result.writes for result in results] == [0, 0, 0]
+    survey = len(PLAN) + 1  # the plan and the default address
+    assert i2c.transactions == survey + len(PLAN)  # one block read per button
+
+
+def test_restart_after_interruption():
+    i2c = SimI2C()
+    asked = []
+    results = Provisioner(i2c, PLAN, **CONFIG).run(_connector(i2c, asked, 1))
+    assert asked == PLAN[:2]
+    assert _outcomes(results) == [
+        (PLAN[0], ASSIGNED),
+        (PLAN[1], MISSING),
+        (PLAN[2], MISSING),
+    ]
+    asked = []
+    results = Provisioner(i2c, PLAN, **CONFIG).run(_connector(i2c, asked))
+    assert asked == PLAN[1:]
+    assert _outcomes(results) == [
+        (PLAN[0], OK),
+        (PLAN[1], ASSIGNED),
+        (PLAN[2], ASSIGNED),
+    ]
+
+
+def test_planned_address_occupied():
+    i2c = SimI2C()
+    i2c.add(SimButton(0x10, dev_id=0x99))  # not a button
+    asked = []
+    results = Provisioner(i2c, PLAN, **CONFIG).run(_connector(i2c, asked))
+    assert asked == [0x12, 0x11]
+    assert _outcomes(results) == [(0x12, ASSIGNED), (0x10, FAILED), (0x11, ASSIGNED)]
+    assert results[1].detail == "occupied by device ID 99"
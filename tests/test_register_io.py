@@ -0,0 +1,113 @@
+# SPDX-FileCopyrightText: Copyright (c) 2021 Greg Paris
+#
+# SPDX-License-Identifier: MIT
+"""Register I/O reuses the per-button scratch buffer: a single access allocates
+nothing beyond what locking the bus costs, and never a buffer of its own."""
+
+import tracemalloc
+import pytest
+from i2c_button import LeanButton, _read_block
+
+_WARMUP = 100  # lets the interpreter settle its own caches first
+_LIMIT = 40  # bytes; room for a large int result, not for a bytearray (57+)
+
+
+class _QuietI2C:
+    """A bus that answers every transfer, and allocates nothing doing it.
+    Reads leave the buffer as it was."""
+
+    def try_lock(self):
+        return True
+
+    def unlock(self):
+        pass
+
+    def writeto(self, address, buffer, *, start=0, end=None):
+        pass
+
+    def readfrom_into(self, address, buffer, *, start=0, end=None):
+        pass
+
+    # pylint: disable=too-many-arguments
+    def writeto_then_readfrom(
+        self,
+        address,
+        out_buffer,
+        in_buffer,
+        *,
+        out_start=0,
+        out_end=None,
+        in_start=0,
+        in_end=None
+    ):
+        pass
+
+
+@pytest.fixture(name="button")
+def fixture_button():
+    return LeanButton(_QuietI2C(), probe=False)
+
+
+def _measure(func):
+    """Traced memory kept, and its peak, over a single call of **func**."""
+    for _ in range(_WARMUP):
+        func()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        func()
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return after - before, peak - before
+
+
+def _beyond_lock(button, func):
+    """Growth and peak of **func**, less the peak of locking the bus alone."""
+
+    def lock():
+        with button.device:
+            pass
+
+    _, lock_peak = _measure(lock)
+    growth, peak = _measure(func)
+    return growth, peak - lock_peak
+
+
+def test_read_status(button):
+    growth, peak = _beyond_lock(button, lambda: button.flags)
+    assert growth < _LIMIT
+    assert peak < _LIMIT
+
+
+def test_read_multibyte(button):
+    button._buf[1:5] = b"\xff\xff\xff\x7f"  # pylint: disable=protected-access
+    assert button.last_press_ms == 0x7FFFFFFF  # not a cached small int
+    growth, peak = _beyond_lock(button, lambda: button.last_press_ms)
+    assert growth < _LIMIT
+    assert peak < _LIMIT
+
+
+@pytest.mark.parametrize("register", ("debounce_ms", "led_bright"))
+def test_write(button, register):
+    def write():
+        setattr(button, register, 20)
+
+    growth, peak = _beyond_lock(button, write)
+    assert growth < _LIMIT
+    assert peak < _LIMIT
+
+
+def test_read_block(button):
+    buf = bytearray(0x20)
+    growth, peak = _beyond_lock(button, lambda: _read_block(button, 0x00, buf))
+    assert growth < _LIMIT
+    assert peak < _LIMIT
+
+
+def test_scratch_buffer_reused(button):
+    buf = button._buf  # pylint: disable=protected-access
+    button.led_bright = 1
+    button.flags  # pylint: disable=pointless-statement
+    assert button._buf is buf  # pylint: disable=protected-access
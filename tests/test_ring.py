@@ -0,0 +1,76 @@
+# SPDX-FileCopyrightText: Copyright (c) 2021 Greg Paris
+#
+# SPDX-License-Identifier: MIT
+"""EventRing on the simulated bus."""
+
+import pytest
+from i2c_button.ring import DROP_NEWEST, EVENT_CLICK, EVENT_PRESS, EventRing
+from i2c_button.simulator import SimClock
+
+PERIOD = 1 << 29  # of supervisor.ticks_ms
+
+
+@pytest.fixture(name="ring_rig")
+def fixture_ring_rig(make_rig):
+    def ring_rig(start):
+        clock = SimClock(start)
+        _, sims, buttons = make_rig(1, clock)
+
+        def ticks_ms():  # as supervisor.ticks_ms would be
+            return round(clock.now * 1000) % PERIOD
+
+        return clock, sims[0], buttons[0], ticks_ms
+
+    return ring_rig
+
+
+def test_timestamps(ring_rig):
+    clock, sim, button, ticks_ms = ring_rig(100.0)
+    ring = EventRing([button], clock_ms=ticks_ms)
+    sim.press()
+    clock.advance(0.25)
+    assert ring.poll() == 1
+    clock.advance(0.25)
+    sim.release()
+    clock.advance(0.25)
+    assert ring.poll() == 1
+    pressed = ring.pop()
+    clicked = ring.pop()
+    assert pressed[:2] == (button, EVENT_PRESS)
+    assert pressed[2] == pytest.approx(100010, abs=1)  # after the 10 ms debounce
+    assert clicked[:2] == (button, EVENT_CLICK)
+    assert clicked[2] == pytest.approx(100500, abs=1)
+
+
+def test_timestamps_across_wrap(ring_rig):
+    clock, sim, button, ticks_ms = ring_rig((PERIOD - 300) / 1000)
+    ring = EventRing([button], clock_ms=ticks_ms)
+    sim.press()
+    clock.advance(0.5)  # the clock wraps before the press is polled
+    ring.poll()
+    sim.release()
+    clock.advance(0.1)
+    ring.poll()
+    _, _, pressed = ring.pop()
+    _, _, clicked = ring.pop()
+    assert clicked == pytest.approx(200, abs=1)
+    assert pressed == pytest.approx(PERIOD - 290, abs=1)
+    assert (clicked - pressed) % PERIOD == pytest.approx(490, abs=2)
+    assert (ticks_ms() - clicked) % PERIOD == pytest.approx(100, abs=1)
+
+
+def test_unwrapped_clock_is_reduced():
+    ring = EventRing([None], capacity=2, clock_ms=lambda: 0)
+    ring.push(0, EVENT_PRESS, 5 * PERIOD + 7)
+    ring.push(0, EVENT_PRESS, -3)
+    assert ring.pop()[2] == 7
+    assert ring.pop()[2] == PERIOD - 3
+
+
+def test_drop_newest():
+    ring = EventRing([None], capacity=2, policy=DROP_NEWEST, clock_ms=lambda: 0)
+    assert ring.push(0, EVENT_PRESS, 1)
+    assert ring.push(0, EVENT_PRESS, 2)
+    assert not ring.push(0, EVENT_PRESS, 3)
+    assert ring.dropped == 1
+    assert [ring.pop()[2] for _ in range(len(ring))] == [1, 2]
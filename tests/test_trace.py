@@ -0,0 +1,86 @@
+# SPDX-FileCopyrightText: Copyright (c) 2021 Greg Paris
+#
+# SPDX-License-Identifier: MIT
+"""Record traffic on the simulated bus, then replay it."""
+
+import errno
+import io
+import pytest
+from i2c_button import LeanButton, _read_block
+from i2c_button.trace import RecordingI2C, ReplayI2C, read_trace
+from i2c_button.simulator import SimButton, SimClock, SimI2C
+
+
+def _session(i2c, fail):
+    """Talk to a button, with one failed read. Returns what was read."""
+    button = LeanButton(i2c)
+    button.led_bright = 50
+    found = [button.led_bright, button.debounce_ms]
+    fail()
+    try:
+        button.status  # pylint: disable=pointless-statement
+    except OSError as exc:
+        found.append(exc.errno)
+    found.append(bytes(button.status))
+    return found
+
+
+def _record(func):
+    """Trace of **func** run against a recording of a simulated button's bus."""
+    i2c = SimI2C()
+    sim = i2c.add(SimButton())
+    file = io.BytesIO()
+    result = func(RecordingI2C(i2c, file), sim)
+    file.seek(0)
+    return file, result
+
+
+def test_round_trip():
+    def run(i2c, sim):
+        return _session(i2c, lambda: setattr(sim, "faults", 1))
+
+    file, recorded = _record(run)
+    assert recorded[2] == errno.ENODEV
+    records = list(read_trace(io.BytesIO(file.getvalue())))
+    assert [record.errno for record in records].count(errno.ENODEV) == 1
+    replay = ReplayI2C(file, SimClock())
+    assert _session(replay, lambda: None) == recorded
+    assert replay.remaining == 0
+
+
+def _block_trace(n_bytes):
+    def run(i2c, _):
+        _read_block(LeanButton(i2c), 0x00, bytearray(n_bytes))
+
+    return _record(run)[0]
+
+
+def test_strict_read_length():
+    replay = ReplayI2C(_block_trace(4))
+    button = LeanButton(replay)
+    with pytest.raises(ValueError):
+        _read_block(button, 0x00, bytearray(6))
+
+
+@pytest.mark.parametrize("n_bytes", (2, 6))
+def test_loose_read_length(n_bytes):
+    replay = ReplayI2C(_block_trace(4), strict=False)
+    buf = bytearray(b"\xff" * n_bytes)
+    _read_block(LeanButton(replay), 0x00, buf)
+    assert len(buf) == n_bytes
+    assert buf == (b"\x5d\x01\x01\x00\xff\xff")[:n_bytes]
+
+
+def test_loose_readfrom_into():
+    def run(i2c, _):
+        assert i2c.try_lock()
+        i2c.readfrom_into(0x6F, bytearray(3))  # registers 0x00 - 0x02
+        i2c.writeto_then_readfrom(0x6F, b"\x1e", bytearray(2))  # 0x1E - 0x1F
+        i2c.unlock()
+
+    replay = ReplayI2C(_record(run)[0], strict=False)
+    buf = bytearray(4)
+    assert replay.try_lock()
+    replay.readfrom_into(0x6F, buf, start=2)
+    replay.writeto_then_readfrom(0x6F, b"\x1e", buf, in_end=1)
+    assert buf == b"\x00\x00\x5d\x01"